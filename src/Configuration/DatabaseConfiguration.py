@@ -3,6 +3,8 @@ from sqlite3 import Connection
 
 from Debug.ConsoleLogger import ConsoleLogger
 from Repository.BaseClasses.DBRepository import DBRepository
+from Repository.LogRepository import LogRepository
+from Repository.MemberRepository import MemberRepository
 
 
 class DatabaseConfiguration:
@@ -14,9 +16,17 @@ class DatabaseConfiguration:
 
         DatabaseConfiguration.__table_member(db)
         DatabaseConfiguration.__table_user(db)
+        DatabaseConfiguration.__table_member_number(db)
+        DatabaseConfiguration.__table_config(db)
+        DatabaseConfiguration.__table_login_attempt(db)
+        DatabaseConfiguration.__table_log(db)
+        DatabaseConfiguration.__table_activity_counter(db)
 
         db.close()
 
+        MemberRepository.index_member_numbers()
+        LogRepository.index_log()
+
     @staticmethod
     def __table_member(db: Connection):
 
@@ -50,3 +60,88 @@ class DatabaseConfiguration:
         ConsoleLogger.v("User table created")
 
         db.commit()
+
+    @staticmethod
+    def __table_member_number(db: Connection):
+
+        ConsoleLogger.v("Creating member number table if not exist")
+
+        dir_path = os.path.dirname(os.path.realpath(__file__))
+        with open(dir_path + '/DatabaseScripts/CreateMemberNumberTable.sql', 'r') as sql_file:
+            sql_script = sql_file.read()
+
+        cursor = db.cursor()
+        cursor.executescript(sql_script)
+        cursor.close()
+
+        ConsoleLogger.v("Member number table created")
+
+        db.commit()
+
+    @staticmethod
+    def __table_config(db: Connection):
+
+        ConsoleLogger.v("Creating config table if not exist")
+
+        dir_path = os.path.dirname(os.path.realpath(__file__))
+        with open(dir_path + '/DatabaseScripts/CreateConfigTable.sql', 'r') as sql_file:
+            sql_script = sql_file.read()
+
+        cursor = db.cursor()
+        cursor.executescript(sql_script)
+        cursor.close()
+
+        ConsoleLogger.v("Config table created")
+
+        db.commit()
+
+    @staticmethod
+    def __table_login_attempt(db: Connection):
+
+        ConsoleLogger.v("Creating login attempt tables if not exist")
+
+        dir_path = os.path.dirname(os.path.realpath(__file__))
+        with open(dir_path + '/DatabaseScripts/CreateLoginAttemptTable.sql', 'r') as sql_file:
+            sql_script = sql_file.read()
+
+        cursor = db.cursor()
+        cursor.executescript(sql_script)
+        cursor.close()
+
+        ConsoleLogger.v("Login attempt tables created")
+
+        db.commit()
+
+    @staticmethod
+    def __table_log(db: Connection):
+
+        ConsoleLogger.v("Creating log table if not exist")
+
+        dir_path = os.path.dirname(os.path.realpath(__file__))
+        with open(dir_path + '/DatabaseScripts/CreateLogTable.sql', 'r') as sql_file:
+            sql_script = sql_file.read()
+
+        cursor = db.cursor()
+        cursor.executescript(sql_script)
+        cursor.close()
+
+        ConsoleLogger.v("Log table created")
+
+        db.commit()
+
+    @staticmethod
+    def __table_activity_counter(db: Connection):
+
+        ConsoleLogger.v("Creating activity counter table if not exist")
+
+        dir_path = os.path.dirname(os.path.realpath(__file__))
+        with open(dir_path + '/DatabaseScripts/CreateActivityCounterTable.sql', 'r') as sql_file:
+            sql_script = sql_file.read()
+
+        cursor = db.cursor()
+        cursor.executescript(sql_script)
+        cursor.close()
+
+        ConsoleLogger.v("Activity counter table created")
+
+        db.commit()
@@ -0,0 +1,8 @@
+CREATE TABLE IF NOT EXISTS activity_counter(
+    key TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (key, bucket)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS activity_counter_bucket ON activity_counter(bucket);
\ No newline at end of file
@@ -0,0 +1,4 @@
+CREATE TABLE IF NOT EXISTS config(
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+) WITHOUT ROWID
\ No newline at end of file
@@ -0,0 +1,13 @@
+CREATE TABLE IF NOT EXISTS log(
+    sequence INTEGER PRIMARY KEY,
+    day TEXT NOT NULL,
+    logType TEXT NOT NULL,
+    suspicious INTEGER NOT NULL,
+    userHash TEXT NOT NULL,
+    payload BLOB NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS log_user ON log(userHash, day);
+CREATE INDEX IF NOT EXISTS log_day ON log(day);
+CREATE INDEX IF NOT EXISTS log_type ON log(logType, day);
+CREATE INDEX IF NOT EXISTS log_suspicious ON log(suspicious, day);
\ No newline at end of file
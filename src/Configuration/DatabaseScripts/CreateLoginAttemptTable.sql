@@ -0,0 +1,13 @@
+CREATE TABLE IF NOT EXISTS login_attempt(
+    key TEXT NOT NULL,
+    attemptedAt REAL NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS login_attempt_key ON login_attempt(key, attemptedAt);
+CREATE INDEX IF NOT EXISTS login_attempt_time ON login_attempt(attemptedAt);
+
+CREATE TABLE IF NOT EXISTS login_block(
+    key TEXT PRIMARY KEY,
+    blocked INTEGER NOT NULL,
+    since REAL NOT NULL
+) WITHOUT ROWID
\ No newline at end of file
@@ -0,0 +1,3 @@
+CREATE TABLE IF NOT EXISTS member_number(
+    hash TEXT PRIMARY KEY
+) WITHOUT ROWID
\ No newline at end of file
@@ -364,8 +364,11 @@ class DatabaseSeeder:
                     "city": "Staryy Merchyk", "houseNumber": "36", "streetName": "Calypso", "zipCode": "1234AA",
                     "emailAddress": "cwagstaff2r@economist.com", "phoneNumber": 45561725, "age": 34}]
 
+        models = []
         for member_data in members:
             member = Member()
             values = list(map(lambda x: str(x), member_data.values()))
             member.populate(values, member_data.keys())
-            MemberRepository.persist_member(member)
+            models.append(member)
+
+        MemberRepository.persist_members(models)
@@ -2,15 +2,18 @@ import os
 import shutil
 from datetime import datetime
 
+from Controllers.LogController import LogController
 from Enum.Color import Color
 from Enum.LogType import LogType
 from Repository.BaseClasses.DBRepository import DBRepository
+from Repository.LogCatalog import LogSegmentCorrupted
 from Repository.LogRepository import LogRepository
 from Security.AuthorizationDecorator import Auth
 from Security.Enum.Permission import Permission
 from View.UserInterfaceAlert import UserInterfaceAlert
 from View.UserInterfaceFlow import UserInterfaceFlow
 from View.UserInterfacePrompt import UserInterfacePrompt
+from View.UserInterfaceRenderer import UserInterfaceRenderer
 from View.UserInterfaceTable import UserInterfaceTable
 from View.UserInterfaceTableRow import UserInterfaceTableRow
 
@@ -20,7 +23,7 @@ class BackupController:
     @Auth.permission_required(Permission.BackupRestore)
     def list_backups(self):
         # Read all files in the backup folder
-        backup_files = os.listdir("Backups")
+        backup_files = [backup for backup in os.listdir("Backups") if backup.endswith(".zip")]
 
         ui = UserInterfaceFlow()
         ui.add(UserInterfaceAlert("Backups", Color.HEADER))  # Header
@@ -57,9 +60,15 @@ class BackupController:
         shutil.unpack_archive(f"Backups/{selected_backup}", backup_folder)
 
         db_file = DBRepository.dbFilename
-        log_file = LogRepository.logFilename
 
-        shutil.copy(f"{backup_folder}/{log_file}", log_file)
+        # Nothing is replaced when a segment of the backup is damaged, the database is restored after the log
+        try:
+            LogRepository.restore(backup_folder)
+        except LogSegmentCorrupted as e:
+            shutil.rmtree(backup_folder)
+            LogController.report_corrupted(e)
+            return
+
         shutil.copy(f"{backup_folder}/{db_file}", db_file)
 
         shutil.rmtree(backup_folder)
@@ -78,17 +87,35 @@ class BackupController:
 
         exit(0)
 
+    @staticmethod
+    def __show_progress(status: int, remaining: int, total: int):
+        copied = (total - remaining) * 100 // total if total > 0 else 100
+
+        UserInterfaceRenderer.write(f"\r{Color.OKBLUE.value}Database kopiëren: {copied}%{Color.ENDC.value}")
+        UserInterfaceRenderer.flush()
+
     @Auth.permission_required(Permission.BackupCreate)
     def create_backup(self):
         db_file = DBRepository.dbFilename
-        log_file = LogRepository.logFilename
 
         backup_folder = "backup_" + datetime.now().strftime("%H.%M.%S_%d-%m-%Y")
 
         os.mkdir(backup_folder)
 
-        shutil.copy(log_file, f"{backup_folder}/{log_file}")
-        shutil.copy(db_file, f"{backup_folder}/{db_file}")
+        # Entries still queued for the background writer belong in the backup
+        LogRepository.flush()
+
+        UserInterfaceFlow.quick_run(UserInterfaceAlert("Backup maken...", Color.OKBLUE), 0)
+
+        DBRepository.backup(f"{backup_folder}/{db_file}", BackupController.__show_progress)
+
+        # The log is cut at the last entry stored in the copied database, so both describe the same moment
+        try:
+            LogRepository.backup(backup_folder, LogRepository.stored_sequence(f"{backup_folder}/{db_file}"))
+        except LogSegmentCorrupted as e:
+            shutil.rmtree(backup_folder)
+            LogController.report_corrupted(e)
+            return
 
         shutil.make_archive(f"{backup_folder}", 'zip', backup_folder)
 
@@ -1,35 +1,225 @@
+from time import sleep
+
+from DTO.LogEntry import LogEntry
+from DTO.LogFilter import LogFilter
+from Enum.ActivityRule import ActivityRule
 from Enum.Color import Color
+from Enum.LogType import LogType
+from Form.LogFilterForm import LogFilterForm
+from Repository.LogCatalog import LogSegmentCorrupted
 from Repository.LogRepository import LogRepository
+from Security.ActivityAggregator import ActivityAggregator
 from Security.AuthorizationDecorator import Auth
 from Security.Enum.Permission import Permission
 from View.UserInterfaceAlert import UserInterfaceAlert
 from View.UserInterfaceFlow import UserInterfaceFlow
+from View.UserInterfacePagedTable import UserInterfacePagedTable
 from View.UserInterfacePrompt import UserInterfacePrompt
+from View.UserInterfaceRenderer import UserInterfaceRenderer
 from View.UserInterfaceTable import UserInterfaceTable
 from View.UserInterfaceTableRow import UserInterfaceTableRow
 
 
 class LogController:
+    # Seconds between two checks for new lines in the live monitor, and the most lines decrypted per check
+    MONITOR_INTERVAL = 1
+    MONITOR_BATCH = 100
 
     @Auth.permission_required(Permission.LogRead)
     def list_logs(self):
+        try:
+            self.__browse_logs()
+        except LogSegmentCorrupted as e:
+            LogController.report_corrupted(e)
 
-        logs = LogRepository.find_all()
+    def __browse_logs(self):
+        page_size = UserInterfacePagedTable.page_size()
+        log_filter = None
+        page = 0
 
-        rows = map(lambda l: l.split(','), logs)
+        # Newest first, the log is read backwards from its end and only the visible lines are decrypted
+        log_page = LogRepository.reader().latest(page_size)
 
-        rows = list(map(lambda l_row: UserInterfaceTableRow(l_row), rows))
+        while True:
+            if log_filter is None:
+                rows = [LogEntry.from_line(line).to_row() for line in reversed(log_page.lines)]
+                has_older = LogRepository.reader().has_older(log_page)
+                header = "Logs, nieuwste eerst"
+            else:
+                rows = [LogEntry.from_line(line).to_row() for line in LogRepository.find_filtered(
+                    log_filter, page * page_size, page_size + 1)]
+                has_older = len(rows) > page_size
+                header = f"Gefilterde logs, nieuwste eerst - pagina {page + 1}"
 
-        rows.insert(0, UserInterfaceTableRow(
-            ["#", "Datum", "Tijd", "Username", "Activiteit", "Extra informatie", "Verdachte activiteit"]))
+            ui = UserInterfaceFlow()
+            ui.add(UserInterfaceAlert(header, Color.HEADER))
+            ui.add(UserInterfacePagedTable(
+                ["#", "Datum", "Tijd", "Username", "Activiteit", "Extra informatie", "Verdachte activiteit"],
+                rows,
+                limit=page_size
+            ))
+            ui.add(UserInterfacePrompt(
+                prompt_text="Druk op N voor oudere logs, V voor nieuwere logs, S<nummer> om naar een logregel te "
+                            "springen, F om te filteren of druk op ENTER om terug te gaan",
+                memory_key="action",
+                validations=[]
+            )
+            )
 
-        ui = UserInterfaceFlow()
-        ui.add(UserInterfaceAlert("Logs", Color.HEADER))
-        ui.add(UserInterfaceTable(rows=rows, has_header=True))
-        ui.add(UserInterfacePrompt(
-            prompt_text="Druk op ENTER om terug te gaan",
-            validations=[]
+            selected = ui.run()["action"].upper()
+
+            if selected == "":
+                return
+
+            if selected == "F":
+                log_filter = LogController.__ask_filter()
+                page = 0
+
+                if log_filter is None:
+                    log_page = LogRepository.reader().latest(page_size)
+                continue
+
+            if selected == "N" and has_older:
+                if log_filter is None:
+                    log_page = LogRepository.reader().older(log_page.start, page_size)
+                else:
+                    page += 1
+                continue
+
+            if selected == "V" and log_filter is None:
+                newer = LogRepository.reader().newer(log_page.end, page_size)
+
+                if len(newer.lines) > 0:
+                    # Near the end of the log the page is filled up with the lines before it
+                    log_page = newer if len(newer.lines) == page_size \
+                        else LogRepository.reader().older(newer.end, page_size)
+                    continue
+
+            if selected == "V" and log_filter is not None and page > 0:
+                page -= 1
+                continue
+
+            if selected.startswith("S") and selected[1:].isdigit() and log_filter is None:
+                found = LogRepository.reader().at_sequence(int(selected[1:]), page_size)
+
+                if len(found.lines) > 0:
+                    log_page = found
+                    continue
+
+            UserInterfaceFlow.quick_run(
+                UserInterfaceAlert("Deze pagina bestaat niet" if selected[:1] in ["N", "V", "S"] else "Ongeldige keuze",
+                                   Color.FAIL),
+                1
+            )
+
+    @Auth.permission_required(Permission.LogRead)
+    def monitor_logs(self):
+        reader = LogRepository.reader()
+
+        log_page = reader.latest(UserInterfacePagedTable.page_size())
+        last_sequence = None
+
+        UserInterfaceFlow.quick_run(
+            UserInterfaceAlert("Live logs - druk op CTRL+C om terug te gaan", Color.HEADER),
+            0
         )
+
+        try:
+            while True:
+                for line in log_page.lines:
+                    LogController.__render_monitor_line(line)
+
+                UserInterfaceRenderer.flush()
+
+                if len(log_page.lines) > 0:
+                    last_sequence = log_page.last_sequence()
+                position = log_page.end
+
+                # Until a line is appended a check is a stat of the active segment, lines already shown are never
+                # decrypted again
+                while not reader.has_newer(position):
+                    sleep(LogController.MONITOR_INTERVAL)
+
+                log_page = reader.newer(position, LogController.MONITOR_BATCH)
+
+                # A rotation or another process can move lines away from a known position, the sequence numbers
+                # tell whether the page continues where the previous one ended
+                if last_sequence is not None and (len(log_page.lines) == 0
+                                                  or log_page.first_sequence() != last_sequence + 1):
+                    log_page = reader.at_sequence(last_sequence + 1, LogController.MONITOR_BATCH)
+        except KeyboardInterrupt:
+            return
+        except LogSegmentCorrupted as e:
+            LogController.report_corrupted(e)
+
+    @Auth.permission_required(Permission.LogRead)
+    def activity_summary(self):
+        # Computed from the activity counters and the latest flagged entries, the log itself is not read
+        type_counts, rule_counts = ActivityAggregator.summary()
+
+        flagged = LogRepository.find_filtered(LogFilter(log_types=[LogType.SuspiciousActivity.name]), 0, 5)
+
+        rule_rows = [
+            [rule.value.description, f"{rule.value.window // 60} min", rule.value.limit, rule_counts[rule]]
+            for rule in ActivityRule
+        ]
+
+        type_rows = [
+            [log_type.value.message, "Ja" if log_type.value.suspicious else "Nee", count]
+            for log_type, count in type_counts.items()
+        ]
+
+        flagged_rows = [LogEntry.from_line(line).to_row() for line in flagged]
+
+        ui = UserInterfaceFlow()
+        ui.add(UserInterfaceAlert("Verdachte activiteit", Color.HEADER))
+        ui.add(UserInterfaceTable(rows=LogController.__table_rows(
+            ["Regel", "Venster", "Limiet per gebruiker", "Hoogste aantal per gebruiker"], rule_rows), has_header=True))
+
+        ui.add(UserInterfaceAlert(f"Activiteit afgelopen {ActivityAggregator.SUMMARY_WINDOW // 60} minuten",
+                                  Color.HEADER))
+        ui.add(UserInterfaceTable(rows=LogController.__table_rows(
+            ["Activiteit", "Verdacht", "Aantal"], type_rows), has_header=True))
+
+        ui.add(UserInterfaceAlert("Laatste meldingen", Color.HEADER))
+        ui.add(UserInterfaceTable(rows=LogController.__table_rows(
+            ["#", "Datum", "Tijd", "Username", "Activiteit", "Extra informatie", "Verdachte activiteit"],
+            flagged_rows), has_header=True))
+
+        ui.add(UserInterfacePrompt("Druk op ENTER om terug te gaan", "action", validations=[]))
+
+        ui.run()
+
+    @staticmethod
+    def report_corrupted(error: LogSegmentCorrupted):
+        # Logged as suspicious, the admin has to find out who changed the segment
+        LogRepository.log(LogType.LogSegmentCorrupted, str(error))
+
+        UserInterfaceFlow.quick_run(
+            UserInterfaceAlert(f"Log segment {error.segment.number} is beschadigd of aangepast, de checksum klopt "
+                               f"niet met de catalogus", Color.FAIL),
+            3
         )
 
-        ui.run()
\ No newline at end of file
+    @staticmethod
+    def __table_rows(header: list[str], rows: list[list]) -> list[UserInterfaceTableRow]:
+        return [UserInterfaceTableRow(header)] + [UserInterfaceTableRow(row) for row in rows]
+
+    @staticmethod
+    def __render_monitor_line(line: str):
+        fields = line.split(",")
+
+        text = f"{fields[0]:>6}  {fields[1]} {fields[2]}  {fields[3]:<20}  {fields[4]:<28}  {','.join(fields[5:-1])}"
+
+        UserInterfaceAlert(text, Color.FAIL if fields[-1] == "Ja" else Color.WHITE).render()
+
+    @staticmethod
+    def __ask_filter():
+        ui = UserInterfaceFlow()
+        ui.add(UserInterfaceAlert("Logs filteren", Color.HEADER))
+
+        ui = LogFilterForm.get_form(ui)
+
+        log_filter = LogFilterForm.to_filter(ui.run())
+
+        return None if log_filter.is_empty() else log_filter
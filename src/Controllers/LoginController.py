@@ -2,7 +2,9 @@ from Controllers.MenuController import MenuController
 from DTO.LoginError import LoginError
 from Enum.Color import Color
 from Enum.LogType import LogType
+from Repository.BaseClasses.RepositoryCache import RepositoryCache
 from Repository.LogRepository import LogRepository
+from Security.LoginThrottle import LoginThrottle
 from Security.SecurityHelper import SecurityHelper
 from Models.User import User
 from Repository.UserRepository import UserRepository
@@ -23,100 +25,121 @@ class LoginController:
     def login(self):
         # 'super_admin' & 'Admin_123?'
 
-        self.__login_tries += 1
+        # Retried in a loop, a failed attempt does not grow the call stack
+        while True:
+            self.__login_tries += 1
 
-        ui = UserInterfaceFlow()
+            ui = UserInterfaceFlow()
 
-        ui.add(
-            UserInterfaceAlert(
-                text="Inloggen",
-                color=Color.OKBLUE
+            ui.add(
+                UserInterfaceAlert(
+                    text="Inloggen",
+                    color=Color.OKBLUE
+                )
             )
-        )
-        ui.add(
-            UserInterfacePrompt(
-                prompt_text="Gebruikersnaam",
-                memory_key="username",
-                validations=[NotBlankValidation()]
+            ui.add(
+                UserInterfacePrompt(
+                    prompt_text="Gebruikersnaam",
+                    memory_key="username",
+                    validations=[NotBlankValidation()]
+                )
             )
-        )
-        ui.add(
-            UserInterfacePrompt(
-                prompt_text="Wachtwoord (invoer verborgen)",
-                memory_key="password",
-                is_password=True,
-                validations=[NotBlankValidation()]
+            ui.add(
+                UserInterfacePrompt(
+                    prompt_text="Wachtwoord (invoer verborgen)",
+                    memory_key="password",
+                    is_password=True,
+                    validations=[NotBlankValidation()]
+                )
             )
-        )
 
-        result = ui.run()
+            result = ui.run()
+
+            if not LoginThrottle.allow(result["username"]):
+                UserInterfaceFlow.quick_run(
+                    UserInterfaceAlert("Te veel inlogpogingen, probeer het later opnieuw", Color.FAIL),
+                    2
+                )
+                return
+
+            # HARDCODED SUPER ADMIN
+            if result["username"] == "super_admin" and result["password"] == "Admin_123?":
+                LoginThrottle.record_success(result["username"])
 
-        # HARDCODED SUPER ADMIN
-        if result["username"] == "super_admin" and result["password"] == "Admin_123?":
-            self.__login_superadmin()
+                self.__login_superadmin()
 
-            LogRepository.log(LogType.SuccessfulLogin)
+                LogRepository.log(LogType.SuccessfulLogin)
 
-            mc = MenuController()
-            mc.menu()
-            return
+                mc = MenuController()
+                mc.menu()
+                return
+
+            username = result["username"]
+            password = result["password"]
 
-        username = result["username"]
-        password = result["password"]
+            loginResult = UserRepository.find_by_credentials(username, password)
 
-        loginResult = UserRepository.find_by_credentials(username, password)
+            user = loginResult[0]
+            error_reason = loginResult[1]
 
-        user = loginResult[0]
-        error_reason = loginResult[1]
+            if user is None:
 
-        if user is None:
+                LoginThrottle.record_failure(username)
 
-            if self.__login_tries >= 3:
-                LogRepository.log(LogType.UnsuccessfulLoginSuspicious,
-                                  "Multiple usernames and passwords are tried in a row")
+                if self.__login_tries >= 3:
+                    LogRepository.log(LogType.UnsuccessfulLoginSuspicious,
+                                      f"Multiple usernames and passwords are tried in a row, last username: "
+                                      f"“{username}”", subject=username)
+
+                    UserInterfaceFlow.quick_run(
+                        UserInterfaceAlert("Te vaak fout ingelogd, afsluiten", Color.FAIL),
+                        2
+                    )
+                    return
 
                 UserInterfaceFlow.quick_run(
-                    UserInterfaceAlert("Te vaak fout ingelogd, afsluiten", Color.FAIL),
+                    UserInterfaceAlert("Incorrecte inloggegevens", Color.FAIL),
                     2
                 )
-                return
 
-            UserInterfaceFlow.quick_run(
-                UserInterfaceAlert("Incorrecte inloggegevens", Color.FAIL),
-                2
-            )
+                if error_reason == LoginError.NotFound:
+                    LogRepository.log(LogType.UnsuccessfulLogin,
+                                      f"username: “{username}” is used for a login attempt with a wrong password",
+                                      subject=username)
 
-            if error_reason == LoginError.NotFound:
-                LogRepository.log(LogType.UnsuccessfulLogin,
-                                  f"username: “{username}” is used for a login attempt with a wrong password")
+                if error_reason == LoginError.BadCredentials:
+                    LogRepository.log(LogType.UnsuccessfulLogin,
+                                      f"username: “{username}” not in the database",
+                                      subject=username)
+
+                continue
+
+            if not SecurityHelper.set_logged_in_user(user):
 
-            if error_reason == LoginError.BadCredentials:
                 LogRepository.log(LogType.UnsuccessfulLogin,
-                                  f"username: “{username}” not in the database")
+                                  f"username: “{username}” user is not correct in database",
+                                  subject=username)
 
-            self.login()
-            return
+                UserInterfaceFlow.quick_run(
+                    UserInterfaceAlert("Er ging iets mis, probeer het nog eens", Color.FAIL),
+                    2
+                )
+                continue
+
+            LoginThrottle.record_success(username)
 
-        if not SecurityHelper.set_logged_in_user(user):
+            # The identity map and query cache are scoped to the session of the logged-in user
+            RepositoryCache.clear_all()
 
-            LogRepository.log(LogType.UnsuccessfulLogin,
-                              f"username: “{username}” user is not correct in database")
+            LogRepository.log(LogType.SuccessfulLogin)
 
             UserInterfaceFlow.quick_run(
-                UserInterfaceAlert("Er ging iets mis, probeer het nog eens", Color.FAIL),
-                2
+                UserInterfaceAlert(f"Welkom {user.username}", Color.OKGREEN)
             )
-            self.login()
-            return
-
-        LogRepository.log(LogType.SuccessfulLogin)
-
-        UserInterfaceFlow.quick_run(
-            UserInterfaceAlert(f"Welkom {user.username}", Color.OKGREEN)
-        )
 
-        mc = MenuController()
-        mc.menu()
+            mc = MenuController()
+            mc.menu()
+            return
 
     def __login_superadmin(self):
         superAdmin = User()
@@ -128,6 +151,8 @@ class LoginController:
 
         SecurityHelper.set_logged_in_user(superAdmin)
 
+        RepositoryCache.clear_all()
+
         UserInterfaceFlow.quick_run(
             UserInterfaceAlert(f"Ingelogd als super admin", Color.OKGREEN)
         )
@@ -1,8 +1,10 @@
+from DTO.Transition import Transition
 from Debug.ConsoleLogger import ConsoleLogger
 from Enum.Color import Color
 from Enum.LogType import LogType
 from Form.MemberForm import MemberForm
 from Models.Member import Member
+from Repository.BaseClasses.UnitOfWork import UnitOfWork
 from Repository.LogRepository import LogRepository
 from Repository.MemberRepository import MemberRepository
 from Security.AuthorizationDecorator import Auth
@@ -10,6 +12,8 @@ from Security.Enum.Permission import Permission
 from Service.IndexService import IndexService
 from View.UserInterfaceAlert import UserInterfaceAlert
 from View.UserInterfaceFlow import UserInterfaceFlow
+from View.UserInterfaceNavigator import UserInterfaceNavigator
+from View.UserInterfacePagedTable import UserInterfacePagedTable
 from View.UserInterfacePrompt import UserInterfacePrompt
 from View.UserInterfaceTable import UserInterfaceTable
 from View.UserInterfaceTableRow import UserInterfaceTableRow
@@ -21,7 +25,8 @@ from View.Validations.OnlyLetterValdation import OnlyLetterValidation
 class MemberController:
 
     @Auth.permission_required(Permission.MemberRead)
-    def list_members(self, members: list[Member] = None):
+    def list_members(self, member_ids: list[int] = None):
+        state = UserInterfaceNavigator.state()
 
         UserInterfaceFlow.quick_run_till_next(
             UserInterfaceAlert("Member overzicht aan het laden...", Color.HEADER)
@@ -29,55 +34,143 @@ class MemberController:
 
         LogRepository.log(LogType.MembersRead)
 
-        if members is None:
-            members = MemberRepository.find_all()
+        page_size = MemberRepository.PAGE_SIZE
+        page = state.get("page", 0)
+
+        # Coming back to the overview the page is served from the identity map, without the deleted members
+        if "page_ids" in state:
+            members = MemberRepository.find_all(state["page_ids"], MemberRepository.OVERVIEW_FIELDS)
+        else:
+            members = MemberController.__jump_page(member_ids, page)
+
+        while True:
+            rows = map(lambda m: [m.number, m.firstName, m.lastName, m.age, m.emailAddress,
+                                  m.streetName + " " + m.houseNumber], members)
+            rows = list(rows)
+
+            for index, row in enumerate(rows):
+                row.insert(0, page * page_size + index + 1)
+
+            header = "Member overzicht" if member_ids is None else "Zoekresultaten"
+
+            ui = UserInterfaceFlow()
+            ui.add(UserInterfaceAlert(f"{header} - pagina {page + 1}", Color.HEADER))
+            ui.add(UserInterfacePagedTable(
+                ["#", "Member nummer", "Voornaam", "Achternaam", "Leeftijd", "E-mailadres", "Adres"],
+                rows,
+                limit=page_size
+            ))
+            ui.add(UserInterfacePrompt(
+                prompt_text="Geef het nummer om te bekijken, druk op N voor de volgende pagina, V voor de vorige "
+                            "pagina, P<nummer> om naar een pagina te springen, Z om te zoeken of druk op ENTER om "
+                            "terug te gaan",
+                memory_key="action"
+            )
+            )
+            selection = ui.run()
+
+            selected = selection["action"].upper()
+
+            if selected == "":
+                return
+
+            if selected == "Z":
+                # A new search replaces the search results instead of stacking up on them
+                if member_ids is not None:
+                    return Transition.replace(self.search_members)
+
+                return Transition.push(self.search_members)
+
+            if selected in ["N", "V"] or (selected.startswith("P") and selected[1:].isdigit()):
+                if selected == "N":
+                    target = page + 1
+                    page_members = MemberController.__next_page(member_ids, page, members)
+                elif selected == "V":
+                    target = page - 1
+                    page_members = MemberController.__previous_page(member_ids, page, members)
+                else:
+                    target = int(selected[1:]) - 1
+                    page_members = MemberController.__jump_page(member_ids, target)
+
+                if len(page_members) == 0:
+                    UserInterfaceFlow.quick_run(
+                        UserInterfaceAlert("Deze pagina bestaat niet", Color.FAIL),
+                        1
+                    )
+                    continue
+
+                page = target
+                members = page_members
+                continue
+
+            if selected.isdigit() is False:
+                UserInterfaceFlow.quick_run(
+                    UserInterfaceAlert("Ongeldige keuze", Color.FAIL),
+                    1
+                )
+                continue
+
+            member_index = int(selected) - 1 - page * page_size
+
+            if member_index < 0 or member_index >= len(members):
+                UserInterfaceFlow.quick_run(
+                    UserInterfaceAlert("Ongeldige keuze", Color.FAIL),
+                    1
+                )
+                continue
+
+            state["page"] = page
+            state["page_ids"] = [member.id for member in members]
+
+            return Transition.push(self.show_member, members[member_index])
+
+    @staticmethod
+    def __next_page(member_ids: list[int], page: int, members: list[Member]) -> list[Member]:
+        if member_ids is not None:
+            return MemberController.__id_page(member_ids, page + 1)
 
-        rows = map(lambda m: [m.number, m.firstName, m.lastName, m.age, m.emailAddress,
-                              m.streetName + " " + m.houseNumber], members)
-        rows = list(rows)
+        if len(members) == 0:
+            return []
 
-        for index, row in enumerate(rows):
-            row.insert(0, index + 1)
+        return MemberRepository.find_page(members[-1].id, fields=MemberRepository.OVERVIEW_FIELDS)
 
-        rows = list(map(lambda m_row: UserInterfaceTableRow(m_row), rows))
+    @staticmethod
+    def __previous_page(member_ids: list[int], page: int, members: list[Member]) -> list[Member]:
+        if page <= 0:
+            return []
 
-        rows.insert(0, UserInterfaceTableRow(
-            ["#", "Member nummer", "Voornaam", "Achternaam", "Leeftijd", "E-mailadres", "Adres"]))
+        if member_ids is not None:
+            return MemberController.__id_page(member_ids, page - 1)
 
-        ui = UserInterfaceFlow()
-        ui.add(UserInterfaceAlert("Member overzicht" if members is None else "Zoekresultaten", Color.HEADER))
-        ui.add(UserInterfaceTable(rows=rows, has_header=True))
-        ui.add(UserInterfacePrompt(
-            prompt_text="Geef het nummer om te bekijken of druk op Z om te zoeken of druk op ENTER om terug te gaan",
-            memory_key="action"
-        )
-        )
-        selection = ui.run()
+        if len(members) == 0:
+            return MemberController.__jump_page(member_ids, page - 1)
 
-        selected = selection["action"]
+        return MemberRepository.find_page_before(members[0].id, fields=MemberRepository.OVERVIEW_FIELDS)
 
-        if selected == "":
-            return
+    @staticmethod
+    def __jump_page(member_ids: list[int], page: int) -> list[Member]:
+        if page < 0:
+            return []
 
-        if selected.upper() == "Z":
-            return self.search_members()
+        if member_ids is not None:
+            return MemberController.__id_page(member_ids, page)
 
-        if selected.isdigit() is False:
-            UserInterfaceFlow.quick_run(
-                UserInterfaceAlert("Ongeldige keuze", Color.FAIL),
-                1
-            )
-            return self.list_members()
+        anchor = MemberRepository.find_page_anchor(page)
 
-        member_index = int(selected) - 1
+        if anchor is None:
+            return []
 
-        try:
-            self.show_member(members[member_index])
-        except IndexError:
-            UserInterfaceFlow.quick_run(
-                UserInterfaceAlert("Ongeldige keuze", Color.FAIL),
-                1
-            )
+        return MemberRepository.find_page(anchor, fields=MemberRepository.OVERVIEW_FIELDS)
+
+    @staticmethod
+    def __id_page(member_ids: list[int], page: int) -> list[Member]:
+        page_size = MemberRepository.PAGE_SIZE
+        page_ids = member_ids[page * page_size:(page + 1) * page_size]
+
+        if len(page_ids) == 0:
+            return []
+
+        return MemberRepository.find_all(page_ids, MemberRepository.OVERVIEW_FIELDS)
 
     @Auth.permission_required(Permission.MemberRead)
     def search_members(self):
@@ -93,22 +186,36 @@ class MemberController:
         )
         query = query_ui.run()['query']
 
-        members = MemberRepository.find_by_query(query)
+        if query == "":
+            return
 
-        if len(members) == 0:
+        member_ids = MemberRepository.find_ids_by_query(query)
+
+        if len(member_ids) == 0:
             UserInterfaceFlow.quick_run(
                 UserInterfaceAlert("Geen resultaten gevonden", Color.FAIL),
                 2
             )
-            return self.list_members()
+            return
 
-        return self.list_members(members)
+        return Transition.replace(self.list_members, member_ids)
 
     @Auth.permission_required(Permission.MemberRead)
     def show_member(self, member: Member):
 
         LogRepository.log(LogType.MemberRead)
 
+        # The overview only loads the fields it renders, load the full record
+        if not all(map(member.is_loaded, Member.ENCRYPTED_FIELDS)):
+            member = MemberRepository.find_by_id(member.id)
+
+            if member is None:
+                UserInterfaceFlow.quick_run(
+                    UserInterfaceAlert("Member niet gevonden", Color.FAIL),
+                    1
+                )
+                return
+
         rows = [
             UserInterfaceTableRow(["Nummer", member.number]),
             UserInterfaceTableRow(["Voornaam", member.firstName]),
@@ -149,8 +256,6 @@ class MemberController:
         elif selected.upper() == "D":
             self.delete_member(member)
 
-        self.list_members()
-
     @Auth.permission_required(Permission.MemberCreate)
     def add_member(self):
 
@@ -164,11 +269,12 @@ class MemberController:
         member = Member()
         member.populate(list(fields.values()), list(fields.keys()))
 
-        LogRepository.log(LogType.MemberCreated, f"id: {member.id} name: {member.firstName} {member.lastName}")
+        with UnitOfWork() as uow:
+            MemberRepository.persist_member(member)
 
-        MemberRepository.persist_member(member)
+            LogRepository.log(LogType.MemberCreated, f"id: {member.id} name: {member.firstName} {member.lastName}")
 
-        IndexService.index_database()
+            uow.after_commit(lambda: IndexService.index_member(member))
 
         UserInterfaceFlow.quick_run(
             UserInterfaceAlert("Member toegevoegd", Color.OKGREEN),
@@ -189,11 +295,17 @@ class MemberController:
 
         member.populate(list(fields.values()), list(fields.keys()))
 
-        MemberRepository.update_member(member)
+        with UnitOfWork() as uow:
+            if not MemberRepository.update_member(member):
+                UserInterfaceFlow.quick_run(
+                    UserInterfaceAlert("Geen wijzigingen", Color.OKBLUE),
+                    2
+                )
+                return
 
-        LogRepository.log(LogType.MemberUpdated, f"id: {member.id} name: {member.firstName} {member.lastName}")
+            LogRepository.log(LogType.MemberUpdated, f"id: {member.id} name: {member.firstName} {member.lastName}")
 
-        IndexService.index_database()
+            uow.after_commit(lambda: IndexService.index_member(member))
 
         UserInterfaceFlow.quick_run(
             UserInterfaceAlert("Member geüpdatet", Color.OKGREEN),
@@ -203,11 +315,12 @@ class MemberController:
     @Auth.permission_required(Permission.MemberDelete)
     def delete_member(self, member: Member):
 
-        MemberRepository.delete_member(member)
+        with UnitOfWork() as uow:
+            MemberRepository.delete_member(member)
 
-        LogRepository.log(LogType.MemberDeleted, f"name: {member.firstName} {member.lastName}")
+            LogRepository.log(LogType.MemberDeleted, f"name: {member.firstName} {member.lastName}")
 
-        IndexService.index_database()
+            uow.after_commit(lambda: IndexService.remove_member(member.id))
 
         UserInterfaceFlow.quick_run(
             UserInterfaceAlert("Member verwijderd", Color.OKGREEN),
@@ -3,21 +3,34 @@ from Controllers.LogController import LogController
 from Controllers.MemberController import MemberController
 from Controllers.UserController import UserController
 from DTO.MenuOption import MenuOption
+from DTO.Transition import Transition
+from Debug.ConsoleLogger import ConsoleLogger
 from Enum.Color import Color
+from Repository.BaseClasses.RepositoryCache import RepositoryCache
+from Repository.LogRepository import LogRepository
 from Security.AuthorizationService import AuthorizationService
 from Security.Enum.Permission import Permission
+from Security.SecurityHelper import SecurityHelper
 from View.UserInterfaceAlert import UserInterfaceAlert
 from View.UserInterfaceFlow import UserInterfaceFlow
+from View.UserInterfaceNavigator import UserInterfaceNavigator
 from View.UserInterfacePrompt import UserInterfacePrompt
+from View.UserInterfaceRenderer import UserInterfaceRenderer
 from View.UserInterfaceTable import UserInterfaceTable
 from View.UserInterfaceTableRow import UserInterfaceTableRow
 
 
 class MenuController:
-    menu_choices: list[MenuOption] = []
+    # Menu options per permission mask, built once and reused by every menu render
+    menus: dict[int, list[MenuOption]] = {}
 
     def __init__(self):
-        self.__create_menu_options()
+        mask = SecurityHelper.get_permission_mask()
+
+        if mask not in MenuController.menus:
+            MenuController.menus[mask] = self.__create_menu_options()
+
+        self.menu_choices = MenuController.menus[mask]
 
     # Once called this will never terminate.
     # So if another controller action is finished it will return to this menu.
@@ -39,8 +52,7 @@ class MenuController:
                 break
 
             try:
-                int(menu_result["selection"])
-                self.menu_choices[int(menu_result["selection"]) - 1].action()
+                choice = self.menu_choices[int(menu_result["selection"]) - 1]
             except IndexError:
                 UserInterfaceFlow.quick_run(
                     UserInterfaceAlert("Ongeldige keuze", Color.FAIL),
@@ -48,6 +60,16 @@ class MenuController:
                 )
                 continue
 
+            # Every screen of the chosen option runs on the navigation stack, ending there returns to this menu
+            UserInterfaceNavigator.run(choice.action)
+
+        for cache in RepositoryCache.instances:
+            ConsoleLogger.v("RepositoryCache %s", cache.stats())
+
+        ConsoleLogger.v("UserInterfaceRenderer %s", UserInterfaceRenderer.stats())
+
+        LogRepository.flush()
+
         UserInterfaceFlow.quick_run(
             UserInterfaceAlert("Tot ziens!", Color.HEADER)
         )
@@ -58,11 +80,11 @@ class MenuController:
 
         if AuthorizationService.current_user_has_permission(Permission.UserConsultantRead) \
                 and not AuthorizationService.current_user_has_permission(Permission.UserSystemAdminRead):
-            return uc.list_consultant_users()
+            return Transition.replace(uc.list_consultant_users)
 
         if not AuthorizationService.current_user_has_permission(Permission.UserConsultantRead) \
                 and AuthorizationService.current_user_has_permission(Permission.UserSystemAdminRead):
-            return uc.list_system_admin_users()
+            return Transition.replace(uc.list_system_admin_users)
 
         menu_ui = UserInterfaceFlow()
         menu_ui.add(UserInterfaceAlert("Welke type user wilt u bekijken?", Color.HEADER))
@@ -82,18 +104,17 @@ class MenuController:
         menu_result = menu_ui.run()
 
         if menu_result["selection"] == "1":
-            return uc.list_consultant_users()
+            return Transition.replace(uc.list_consultant_users)
 
         if menu_result["selection"] == "2":
-            return uc.list_system_admin_users()
+            return Transition.replace(uc.list_system_admin_users)
 
         UserInterfaceFlow.quick_run(
             UserInterfaceAlert("Ongeldige keuze", Color.FAIL),
             1
         )
 
-        mc = MenuController()
-        return mc.user_type_menu()
+        return Transition.replace(self.user_type_menu)
 
     def user_create_type_menu(self) -> None:
 
@@ -101,11 +122,11 @@ class MenuController:
 
         if AuthorizationService.current_user_has_permission(Permission.UserConsultantRead) \
                 and not AuthorizationService.current_user_has_permission(Permission.UserSystemAdminRead):
-            return uc.create_consultant()
+            return Transition.replace(uc.create_consultant)
 
         if not AuthorizationService.current_user_has_permission(Permission.UserConsultantRead) \
                 and AuthorizationService.current_user_has_permission(Permission.UserSystemAdminRead):
-            return uc.create_system_admin()
+            return Transition.replace(uc.create_system_admin)
 
         menu_ui = UserInterfaceFlow()
         menu_ui.add(UserInterfaceAlert("Welke type user wilt u toevoegen?", Color.HEADER))
@@ -125,51 +146,55 @@ class MenuController:
         menu_result = menu_ui.run()
 
         if menu_result["selection"] == "1":
-            return uc.create_consultant()
+            return Transition.replace(uc.create_consultant)
 
         if menu_result["selection"] == "2":
-            return uc.create_system_admin()
+            return Transition.replace(uc.create_system_admin)
 
         UserInterfaceFlow.quick_run(
             UserInterfaceAlert("Ongeldige keuze", Color.FAIL),
             1
         )
 
-        mc = MenuController()
-        return mc.user_type_menu()
+        return Transition.replace(self.user_create_type_menu)
 
-    def __create_menu_options(self):
+    def __create_menu_options(self) -> list[MenuOption]:
+        menu_choices = []
 
         mc = MemberController()
 
         if AuthorizationService.current_user_has_permission(Permission.MemberRead):
-            self.menu_choices.append(MenuOption("Member overzicht", mc.list_members))
+            menu_choices.append(MenuOption("Member overzicht", mc.list_members))
 
         if AuthorizationService.current_user_has_permission(Permission.MemberCreate):
-            self.menu_choices.append(MenuOption("Member toevoegen", mc.add_member))
+            menu_choices.append(MenuOption("Member toevoegen", mc.add_member))
 
         lc = LogController()
 
         if AuthorizationService.current_user_has_permission(Permission.LogRead):
-            self.menu_choices.append(MenuOption("Logs bekijken", lc.list_logs))
+            menu_choices.append(MenuOption("Logs bekijken", lc.list_logs))
+            menu_choices.append(MenuOption("Logs live volgen", lc.monitor_logs))
+            menu_choices.append(MenuOption("Verdachte activiteit", lc.activity_summary))
 
         if AuthorizationService.current_user_has_permission(Permission.UserConsultantRead) \
                 or AuthorizationService.current_user_has_permission(Permission.UserSystemAdminRead):
-            self.menu_choices.append(MenuOption("User overzicht", self.user_type_menu))
+            menu_choices.append(MenuOption("User overzicht", self.user_type_menu))
 
         if AuthorizationService.current_user_has_permission(Permission.UserConsultantRead) \
                 or AuthorizationService.current_user_has_permission(Permission.UserSystemAdminRead):
-            self.menu_choices.append(MenuOption("User aanmaken", self.user_create_type_menu))
+            menu_choices.append(MenuOption("User aanmaken", self.user_create_type_menu))
 
         bc = BackupController()
 
         if AuthorizationService.current_user_has_permission(Permission.BackupCreate):
-            self.menu_choices.append(MenuOption("Backup maken", bc.create_backup))
+            menu_choices.append(MenuOption("Backup maken", bc.create_backup))
 
         if AuthorizationService.current_user_has_permission(Permission.BackupRestore):
-            self.menu_choices.append(MenuOption("Backup terugzetten", bc.list_backups))
+            menu_choices.append(MenuOption("Backup terugzetten", bc.list_backups))
 
         uc = UserController()
 
         if AuthorizationService.current_user_has_permission(Permission.UserUpdateOwnPassword):
-            self.menu_choices.append(MenuOption("Wachtwoord wijzigingen", uc.reset_own_password))
+            menu_choices.append(MenuOption("Wachtwoord wijzigingen", uc.reset_own_password))
+
+        return menu_choices
@@ -1,11 +1,13 @@
 from datetime import datetime
 
+from DTO.Transition import Transition
 from Enum.Color import Color
 from Enum.LogType import LogType
 from Enum.UserType import UserType
 from Form.UserForm import UserForm
 from Form.UserPasswordForm import UserPasswordForm
 from Models.User import User
+from Repository.BaseClasses.UnitOfWork import UnitOfWork
 from Repository.LogRepository import LogRepository
 from Repository.UserRepository import UserRepository
 from Security.AuthorizationDecorator import Auth
@@ -34,7 +36,7 @@ class UserController:
 
         LogRepository.log(LogType.UserConsultantsRead)
 
-        self.__show_users(Role.CONSULTANT, users)
+        return self.__show_users(Role.CONSULTANT, users)
 
     @Auth.permission_required(Permission.UserSystemAdminRead)
     def list_system_admin_users(self, users: list[User] = None):
@@ -45,15 +47,19 @@ class UserController:
 
         LogRepository.log(LogType.UserSystemAdminsRead)
 
-        self.__show_users(Role.SYSTEM_ADMIN, users)
+        return self.__show_users(Role.SYSTEM_ADMIN, users)
 
     def __show_users(self, role: Role, users: list[User] = None):
 
         header_type = "Consultant" if role.CONSULTANT else "Systeem beheerder"
-        header = f"{header_type} overzicht" if users is None else "Zoekresultaten"
+        is_search = users is not None
+        header = f"{header_type} overzicht" if not is_search else "Zoekresultaten"
 
         if users is None:
             users = UserRepository.find_all_by_role(role)
+        else:
+            # Served from the identity map, coming back from a user the deleted ones are left out
+            users = UserRepository.find_all_by_role(role, [user.id for user in users])
 
         rows = map(lambda u: [u.username, u.firstName, u.lastName, u.registrationDate], users)
         rows = list(rows)
@@ -82,10 +88,13 @@ class UserController:
             return
 
         if selected.upper() == "Z":
-            if role == Role.CONSULTANT:
-                return self.search_consultant_user()
-            if role == Role.SYSTEM_ADMIN:
-                return self.search_system_admin_user()
+            search = self.search_consultant_user if role == Role.CONSULTANT else self.search_system_admin_user
+
+            # A new search replaces the search results instead of stacking up on them
+            if is_search:
+                return Transition.replace(search)
+
+            return Transition.push(search)
 
         user_index = int(selected) - 1
 
@@ -99,12 +108,10 @@ class UserController:
             return
 
         if role == Role.SYSTEM_ADMIN:
-            self.show_system_admin_user(selected_user)
+            return Transition.push(self.show_system_admin_user, selected_user)
 
         if role == Role.CONSULTANT:
-            self.show_consultant_user(selected_user)
-
-        return self.__show_users(role, users)
+            return Transition.push(self.show_consultant_user, selected_user)
 
     @Auth.permission_required(Permission.UserConsultantRead)
     def show_consultant_user(self, user: User):
@@ -167,12 +174,6 @@ class UserController:
             if user.role == Role.SYSTEM_ADMIN.name:
                 self.reset_system_admin_user(user)
 
-        if user.role == Role.CONSULTANT:
-            return self.list_consultant_users()
-
-        if user.role == Role.SYSTEM_ADMIN:
-            return self.list_system_admin_users()
-
     @Auth.permission_required(Permission.UserSystemAdminCreate)
     def create_system_admin(self):
         return self.__create_user(Role.SYSTEM_ADMIN)
@@ -195,6 +196,13 @@ class UserController:
         user = User()
         user.populate(list(fields.values()), list(fields.keys()))
 
+        if IndexService.username_exists(user.username):
+            UserInterfaceFlow.quick_run(
+                UserInterfaceAlert("Deze username is al in gebruik", Color.FAIL),
+                2
+            )
+            return
+
         plain_pw = UserRepository.generate_valid_password()
 
         user.password = HashService.hash(plain_pw).decode()
@@ -203,15 +211,16 @@ class UserController:
 
         user.registrationDate = datetime.now().strftime("%d-%m-%Y")
 
-        if user.role == Role.CONSULTANT.name:
-            LogRepository.log(LogType.UserConsultantCreated, f"id: {user.id} username: {user.username}")
+        with UnitOfWork() as uow:
+            UserRepository.persist_user(user)
 
-        if user.role == Role.SYSTEM_ADMIN.name:
-            LogRepository.log(LogType.UserSystemAdminCreated, f"id: {user.id} username: {user.username}")
+            if user.role == Role.CONSULTANT.name:
+                LogRepository.log(LogType.UserConsultantCreated, f"id: {user.id} username: {user.username}")
 
-        UserRepository.persist_user(user)
+            if user.role == Role.SYSTEM_ADMIN.name:
+                LogRepository.log(LogType.UserSystemAdminCreated, f"id: {user.id} username: {user.username}")
 
-        IndexService.index_database()
+            uow.after_commit(lambda: IndexService.index_user(user))
 
         UserInterfaceFlow.quick_run(
             UserInterfaceAlert("User toegevoegd", Color.OKGREEN),
@@ -245,15 +254,21 @@ class UserController:
 
         user.populate(list(fields.values()), list(fields.keys()))
 
-        UserRepository.update_user(user)
+        with UnitOfWork() as uow:
+            if not UserRepository.update_user(user):
+                UserInterfaceFlow.quick_run(
+                    UserInterfaceAlert("Geen wijzigingen", Color.OKBLUE),
+                    2
+                )
+                return
 
-        if user.role == Role.CONSULTANT.name:
-            LogRepository.log(LogType.UserConsultantUpdated, f"id: {user.id} username: {user.username}")
+            if user.role == Role.CONSULTANT.name:
+                LogRepository.log(LogType.UserConsultantUpdated, f"id: {user.id} username: {user.username}")
 
-        if user.role == Role.SYSTEM_ADMIN.name:
-            LogRepository.log(LogType.UserSystemAdminUpdated, f"id: {user.id} username: {user.username}")
+            if user.role == Role.SYSTEM_ADMIN.name:
+                LogRepository.log(LogType.UserSystemAdminUpdated, f"id: {user.id} username: {user.username}")
 
-        IndexService.index_database()
+            uow.after_commit(lambda: IndexService.index_user(user))
 
         UserInterfaceFlow.quick_run(
             UserInterfaceAlert("User geüpdatet", Color.OKGREEN),
@@ -269,15 +284,16 @@ class UserController:
         return self.delete_user(user)
 
     def delete_user(self, user: User):
-        UserRepository.delete_user(user)
+        with UnitOfWork() as uow:
+            UserRepository.delete_user(user)
 
-        if user.role == Role.CONSULTANT.name:
-            LogRepository.log(LogType.UserConsultantDeleted, f"username: {user.username}")
+            if user.role == Role.CONSULTANT.name:
+                LogRepository.log(LogType.UserConsultantDeleted, f"username: {user.username}")
 
-        if user.role == Role.SYSTEM_ADMIN.name:
-            LogRepository.log(LogType.UserSystemAdminDeleted, f"username: {user.username}")
+            if user.role == Role.SYSTEM_ADMIN.name:
+                LogRepository.log(LogType.UserSystemAdminDeleted, f"username: {user.username}")
 
-        IndexService.index_database()
+            uow.after_commit(lambda: IndexService.remove_user(user.id))
 
         UserInterfaceFlow.quick_run(
             UserInterfaceAlert("User verwijderd", Color.OKGREEN),
@@ -324,11 +340,11 @@ class UserController:
 
         user.password = HashService.hash(fields["password"]).decode()
 
-        UserRepository.update_user_password(user)
-
-        LogRepository.log(LogType.OwnPasswordUpdated)
+        # The password is not part of the index, so there is nothing to re-index
+        with UnitOfWork():
+            UserRepository.update_user_password(user)
 
-        IndexService.index_database()
+            LogRepository.log(LogType.OwnPasswordUpdated)
 
         UserInterfaceFlow.quick_run(
             UserInterfaceAlert("Wachtwoord geüpdatet", Color.OKGREEN),
@@ -362,12 +378,9 @@ class UserController:
                 UserInterfaceAlert("Geen resultaten gevonden", Color.FAIL),
                 2
             )
-            if role == Role.CONSULTANT:
-                return self.list_consultant_users()
-            if role == Role.SYSTEM_ADMIN:
-                return self.list_system_admin_users()
+            return
 
         if role == Role.CONSULTANT:
-            return self.list_consultant_users(users)
+            return Transition.replace(self.list_consultant_users, users)
         if role == Role.SYSTEM_ADMIN:
-            return self.list_system_admin_users(users)
+            return Transition.replace(self.list_system_admin_users, users)
@@ -0,0 +1,11 @@
+class ActivityRuleDTO:
+    description: str
+    logTypes: list
+    window: int
+    limit: int
+
+    def __init__(self, description: str, log_types: list, window: int, limit: int):
+        self.description = description
+        self.logTypes = log_types
+        self.window = window
+        self.limit = limit
@@ -0,0 +1,55 @@
+from datetime import datetime
+
+
+class LogEntry:
+    # A decrypted log line: sequence,date,time,username,activity,details,suspicious. The details can contain commas
+    sequence: int
+    moment: datetime
+    username: str
+    activity: str
+    details: str
+    suspicious: bool
+
+    def __init__(self, sequence: int, moment: datetime, username: str, activity: str, details: str,
+                 suspicious: bool):
+        self.sequence = sequence
+        self.moment = moment
+        self.username = username
+        self.activity = activity
+        self.details = details
+        self.suspicious = suspicious
+
+    @staticmethod
+    def from_line(line: str):
+        fields = line.split(",")
+
+        return LogEntry(
+            int(fields[0]),
+            datetime.strptime(f"{fields[1]} {fields[2]}", "%d-%m-%Y %H:%M:%S"),
+            fields[3],
+            fields[4],
+            ",".join(fields[5:-1]),
+            fields[-1] == "Ja"
+        )
+
+    def to_row(self) -> list:
+        # The columns of the log screens
+        return [
+            self.sequence,
+            self.moment.strftime("%d-%m-%Y"),
+            self.moment.strftime("%H:%M:%S"),
+            self.username,
+            self.activity,
+            self.details,
+            "Ja" if self.suspicious else "Nee"
+        ]
+
+    def to_dict(self) -> dict:
+        return {
+            "sequence": self.sequence,
+            "timestamp": self.moment.isoformat(),
+            "username": self.username,
+            "activity": self.activity,
+            "details": self.details,
+            "suspicious": self.suspicious
+        }
@@ -0,0 +1,22 @@
+from datetime import date
+from typing import Optional
+
+
+class LogFilter:
+    username: Optional[str]
+    since: Optional[date]
+    until: Optional[date]
+    logTypes: Optional[list[str]]
+    suspicious: Optional[bool]
+
+    def __init__(self, username: str = None, since: date = None, until: date = None, log_types: list[str] = None,
+                 suspicious: bool = None):
+        self.username = username
+        self.since = since
+        self.until = until
+        self.logTypes = log_types
+        self.suspicious = suspicious
+
+    def is_empty(self) -> bool:
+        return self.username is None and self.since is None and self.until is None and self.logTypes is None \
+            and self.suspicious is None
@@ -0,0 +1,16 @@
+class LogPage:
+    # Decrypted lines in log order, with the (segment, byte offset) positions the page starts and ends at
+    lines: list[str]
+    start: tuple[int, int]
+    end: tuple[int, int]
+
+    def __init__(self, lines: list[str], start: tuple[int, int], end: tuple[int, int]):
+        self.lines = lines
+        self.start = start
+        self.end = end
+
+    def first_sequence(self) -> int:
+        return int(self.lines[0].split(",")[0])
+
+    def last_sequence(self) -> int:
+        return int(self.lines[-1].split(",")[0])
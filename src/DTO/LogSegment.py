@@ -0,0 +1,42 @@
+class LogSegment:
+    # A closed, compressed part of the log. Times are ISO formatted, the checksum is the SHA-256 of the compressed file
+    number: int
+    filename: str
+    firstSequence: int
+    lastSequence: int
+    since: str
+    until: str
+    checksum: str
+
+    def __init__(self, number: int, filename: str, first_sequence: int, last_sequence: int, since: str, until: str,
+                 checksum: str):
+        self.number = number
+        self.filename = filename
+        self.firstSequence = first_sequence
+        self.lastSequence = last_sequence
+        self.since = since
+        self.until = until
+        self.checksum = checksum
+
+    def to_dict(self) -> dict:
+        return {
+            "number": self.number,
+            "filename": self.filename,
+            "firstSequence": self.firstSequence,
+            "lastSequence": self.lastSequence,
+            "since": self.since,
+            "until": self.until,
+            "checksum": self.checksum
+        }
+
+    @staticmethod
+    def from_dict(values: dict):
+        return LogSegment(
+            values["number"],
+            values["filename"],
+            values["firstSequence"],
+            values["lastSequence"],
+            values["since"],
+            values["until"],
+            values["checksum"]
+        )
@@ -0,0 +1,37 @@
+from typing import Callable
+
+from Enum.TransitionType import TransitionType
+
+
+class Transition:
+    type: TransitionType
+    action: Callable
+    args: tuple
+    kwargs: dict
+
+    # Screen state, kept as long as the screen is on the navigation stack
+    state: dict
+
+    def __init__(self, transition_type: TransitionType, action: Callable = None, args: tuple = (),
+                 kwargs: dict = None):
+        self.type = transition_type
+        self.action = action
+        self.args = args
+        self.kwargs = kwargs if kwargs is not None else {}
+        self.state = {}
+
+    @staticmethod
+    def push(action: Callable, *args, **kwargs):
+        return Transition(TransitionType.PUSH, action, args, kwargs)
+
+    @staticmethod
+    def replace(action: Callable, *args, **kwargs):
+        return Transition(TransitionType.REPLACE, action, args, kwargs)
+
+    @staticmethod
+    def back():
+        return Transition(TransitionType.BACK)
+
+    @staticmethod
+    def exit():
+        return Transition(TransitionType.EXIT)
@@ -5,21 +5,27 @@ class ConsoleLogger(object):
 
     loglevel = 0
 
+    # The message is only formatted with the args when the level is active, so hot paths can log for free
+
     @staticmethod
     def set_loglevel(level: int):
         ConsoleLogger.loglevel = level
 
     @staticmethod
-    def v(message: str):
+    def v(message: str, *args):
         if ConsoleLogger.loglevel >= 1:
-            print(f"[{datetime.now().isoformat()}] {message}")
+            ConsoleLogger.__print(message, args)
 
     @staticmethod
-    def vv(message: str):
+    def vv(message: str, *args):
         if ConsoleLogger.loglevel >= 2:
-            print(f"[{datetime.now().isoformat()}] {message}")
+            ConsoleLogger.__print(message, args)
 
     @staticmethod
-    def vvv(message: str):
+    def vvv(message: str, *args):
         if ConsoleLogger.loglevel >= 3:
-            print(f"[{datetime.now().isoformat()}] {message}")
\ No newline at end of file
+            ConsoleLogger.__print(message, args)
+
+    @staticmethod
+    def __print(message: str, args: tuple):
+        print(f"[{datetime.now().isoformat()}] {message % args if args else message}")
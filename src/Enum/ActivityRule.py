@@ -0,0 +1,15 @@
+from enum import Enum
+
+from DTO.ActivityRule import ActivityRuleDTO
+from Enum.LogType import LogType
+
+
+class ActivityRule(Enum):
+    # Entries of the log types are counted per username, crossing the limit within the window (in seconds) is flagged
+    FailedLogins = ActivityRuleDTO("Mislukte inlogpogingen",
+                                   [LogType.UnsuccessfulLogin, LogType.UnsuccessfulLoginSuspicious], 300, 10)
+    MemberReads = ActivityRuleDTO("Members bekeken", [LogType.MemberRead, LogType.MembersRead], 300, 100)
+    Deletes = ActivityRuleDTO("Verwijderingen",
+                              [LogType.MemberDeleted, LogType.UserConsultantDeleted, LogType.UserSystemAdminDeleted],
+                              600, 10)
+    BackupRestores = ActivityRuleDTO("Backups teruggezet", [LogType.BackupRestored], 3600, 2)
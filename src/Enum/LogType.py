@@ -25,6 +25,9 @@ class LogType(Enum):
     BackupCreated = LogTypeDTO("Backup is created")
     BackupRestored = LogTypeDTO("Backup is restored")
 
+    LogExported = LogTypeDTO("Log is exported")
+    LogSegmentCorrupted = LogTypeDTO("Log segment is corrupted", True)
+
     SuccessfulLogin = LogTypeDTO("Logged in")
     UnsuccessfulLogin = LogTypeDTO("Unsuccessful login")
     UnsuccessfulLoginSuspicious = LogTypeDTO("Unsuccessful login", True)
@@ -32,4 +35,6 @@ class LogType(Enum):
     PasswordReset = LogTypeDTO("Password reset")
     OwnPasswordUpdated = LogTypeDTO("Own password is updated")
 
+    SuspiciousActivity = LogTypeDTO("Suspicious activity", True)
+
 
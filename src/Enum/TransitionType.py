@@ -0,0 +1,8 @@
+from enum import Enum
+
+
+class TransitionType(Enum):
+    PUSH = "push"
+    REPLACE = "replace"
+    BACK = "back"
+    EXIT = "exit"
\ No newline at end of file
@@ -0,0 +1,68 @@
+from datetime import datetime
+from typing import TypeVar
+
+from DTO.LogFilter import LogFilter
+from Enum.Color import Color
+from Enum.LogType import LogType
+from Form.BaseClasses.Form import Form
+from View.UserInterfaceAlert import UserInterfaceAlert
+from View.UserInterfaceFlow import UserInterfaceFlow
+from View.UserInterfacePrompt import UserInterfacePrompt
+from View.Validations.DateValidation import DateValidation
+from View.Validations.NoSpecialCharsValidation import NoSpecialCharsValidation
+from View.Validations.YesNoValidation import YesNoValidation
+
+
+class LogFilterForm(Form):
+
+    T = TypeVar("T")
+
+    @staticmethod
+    def get_form(ui: UserInterfaceFlow, existing: T = None) -> UserInterfaceFlow:
+        ui.add(UserInterfaceAlert(text="Laat een veld leeg om er niet op te filteren", color=Color.WHITE))
+        ui.add(UserInterfacePrompt(
+            prompt_text="Username",
+            memory_key="username")
+        )
+
+        ui.add(UserInterfacePrompt(
+            prompt_text="Vanaf datum (dd-mm-jjjj)",
+            memory_key="since",
+            validations=[DateValidation()])
+        )
+
+        ui.add(UserInterfacePrompt(
+            prompt_text="Tot en met datum (dd-mm-jjjj)",
+            memory_key="until",
+            validations=[DateValidation()])
+        )
+
+        ui.add(UserInterfacePrompt(
+            prompt_text="Activiteit (bijvoorbeeld 'login' of 'member')",
+            memory_key="activity",
+            validations=[NoSpecialCharsValidation()])
+        )
+
+        ui.add(UserInterfacePrompt(
+            prompt_text="Alleen verdachte activiteit (J/N)",
+            memory_key="suspicious",
+            validations=[YesNoValidation()])
+        )
+
+        return ui
+
+    @staticmethod
+    def to_filter(fields: dict) -> LogFilter:
+        log_types = None
+        if fields["activity"] != "":
+            # The activity matches every log type with that text in its message
+            log_types = [log_type.name for log_type in LogType
+                         if fields["activity"].lower() in log_type.value.message.lower()]
+
+        return LogFilter(
+            username=fields["username"] if fields["username"] != "" else None,
+            since=datetime.strptime(fields["since"], "%d-%m-%Y").date() if fields["since"] != "" else None,
+            until=datetime.strptime(fields["until"], "%d-%m-%Y").date() if fields["until"] != "" else None,
+            log_types=log_types,
+            suspicious=True if fields["suspicious"].upper() == "J" else None
+        )
@@ -1,35 +1,51 @@
+from Models.BaseClasses.EncryptedField import EncryptedField
 from Service.EncryptionService import EncryptionService
 
 
 class EncryptableModel:
+    # Encryption happens at the database boundary, ModelMapper stores ciphertexts that the fields decrypt on first
+    # access and encrypted_values encrypts for inserts and updates
     ENCRYPTED_FIELDS = []
 
-    is_encrypted = False
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
 
-    def __init__(self, is_encrypted: bool = False):
-        self.is_encrypted = is_encrypted
+        # Route every encrypted field through a descriptor so values can be decrypted on first access
+        for field in cls.ENCRYPTED_FIELDS:
+            if not isinstance(cls.__dict__.get(field), EncryptedField):
+                setattr(cls, field, EncryptedField(field, getattr(cls, field, None)))
 
-    def encrypt(self):
-        if self.is_encrypted:
-            return
-        self.is_encrypted = True
-        for field in self.ENCRYPTED_FIELDS:
-            value = getattr(self, field)
+    def is_loaded(self, field: str) -> bool:
+        return field in self.__dict__ or field in self.__dict__.get("_ciphertexts", {})
+
+    def dirty_fields(self) -> list[str]:
+        # Fields that are still encrypted were never read and can not have been changed
+        original = self.__dict__.get("_original", {})
+
+        return [
+            field for field in self.ENCRYPTED_FIELDS
+            if field in self.__dict__ and (field not in original or self.__dict__[field] != original[field])
+        ]
+
+    def clean_values(self, fields: list[str] = None) -> dict:
+        # The values as written now, passed to mark_clean once the write is committed
+        return {
+            field: self.__dict__[field] for field in (fields if fields is not None else self.ENCRYPTED_FIELDS)
+            if field in self.__dict__
+        }
 
-            if value is None:
-                continue
+    def mark_clean(self, values: dict):
+        self.__dict__.setdefault("_original", {}).update(values)
 
-            setattr(self, field, EncryptionService.encrypt(value))
+    def encrypted_values(self, fields: list[str]) -> dict:
+        values = {}
 
-    def decrypt(self):
-        if not self.is_encrypted:
-            return
-        self.is_encrypted = False
-        for field in self.ENCRYPTED_FIELDS:
+        for field in fields:
             value = getattr(self, field)
 
-            if value is None:
-                continue
+            if field in self.ENCRYPTED_FIELDS and value is not None:
+                value = EncryptionService.encrypt(value)
 
-            setattr(self, field, EncryptionService.decrypt(value))
+            values[field] = value
 
+        return values
@@ -0,0 +1,34 @@
+from Service.EncryptionService import EncryptionService
+
+
+class EncryptedField:
+
+    def __init__(self, name: str, default=None):
+        self.name = name
+        self.default = default
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self.default
+
+        values = instance.__dict__
+
+        if self.name in values:
+            return values[self.name]
+
+        # Decrypt a lazily loaded ciphertext on first access and keep the plain value
+        ciphertexts = values.get("_ciphertexts")
+        if ciphertexts is not None and self.name in ciphertexts:
+            value = EncryptionService.decrypt(ciphertexts.pop(self.name))
+            values[self.name] = value
+            values.setdefault("_original", {})[self.name] = value
+            return value
+
+        return self.default
+
+    def __set__(self, instance, value):
+        instance.__dict__[self.name] = value
+
+        ciphertexts = instance.__dict__.get("_ciphertexts")
+        if ciphertexts is not None:
+            ciphertexts.pop(self.name, None)
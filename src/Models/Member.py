@@ -1,9 +1,10 @@
 from Models.BaseClasses.DatabaseModel import DatabaseModel
 from Models.BaseClasses.EncryptableModel import EncryptableModel
-from Models.BaseClasses.SerializeableModel import SerializeableModel
 
 
-class Member(EncryptableModel, DatabaseModel, SerializeableModel):
+class Member(EncryptableModel, DatabaseModel):
+    TABLE_NAME = "member"
+
     ENCRYPTED_FIELDS = [
         'firstName',
         'lastName',
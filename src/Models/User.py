@@ -1,9 +1,10 @@
 from Models.BaseClasses.DatabaseModel import DatabaseModel
 from Models.BaseClasses.EncryptableModel import EncryptableModel
-from Models.BaseClasses.SerializeableModel import SerializeableModel
 
 
-class User(EncryptableModel, DatabaseModel, SerializeableModel):
+class User(EncryptableModel, DatabaseModel):
+    TABLE_NAME = "user"
+
     ENCRYPTED_FIELDS = ['username', 'password', 'role', 'firstName', 'lastName', 'registrationDate']
 
     id: int = None
@@ -0,0 +1,62 @@
+from sqlite3 import Cursor
+
+from Repository.BaseClasses.DBRepository import DBRepository
+
+
+class ActivityCounterRepository:
+    # Counters per key and time bucket. The write methods take the cursor of the log writer, which runs its own
+    # transaction on another thread
+
+    @staticmethod
+    def add(cursor: Cursor, increments: dict[tuple[str, int], int]):
+        cursor.executemany(
+            "INSERT INTO activity_counter (key, bucket, count) VALUES (?, ?, ?) "
+            "ON CONFLICT(key, bucket) DO UPDATE SET count = count + excluded.count",
+            [(key, bucket, count) for (key, bucket), count in increments.items()]
+        )
+
+    @staticmethod
+    def sum_since(cursor: Cursor, key: str, since: int) -> int:
+        cursor.execute("SELECT COALESCE(SUM(count), 0) FROM activity_counter WHERE key = ? AND bucket > ?",
+                       (key, since))
+
+        return cursor.fetchone()[0]
+
+    @staticmethod
+    def prune(cursor: Cursor, before: int):
+        cursor.execute("DELETE FROM activity_counter WHERE bucket <= ?", (before,))
+
+    @staticmethod
+    def find_sums(keys: list[str], since: int) -> dict[str, int]:
+        with DBRepository.connection() as db:
+            cursor = db.cursor()
+
+            cursor.execute(
+                "SELECT key, SUM(count) FROM activity_counter WHERE key IN (%s) AND bucket > ? GROUP BY key"
+                % ','.join('?' * len(keys)),
+                keys + [since]
+            )
+
+            result = cursor.fetchall()
+
+            cursor.close()
+
+        return dict(result)
+
+    @staticmethod
+    def find_highest_sum(prefix: str, since: int) -> int:
+        # The highest sum of the keys starting with the prefix, the prefix is matched on the primary key
+        with DBRepository.connection() as db:
+            cursor = db.cursor()
+
+            cursor.execute(
+                "SELECT COALESCE(MAX(total), 0) FROM (SELECT SUM(count) AS total FROM activity_counter "
+                "WHERE key GLOB ? AND bucket > ? GROUP BY key)",
+                (prefix + "*", since)
+            )
+
+            result = cursor.fetchone()[0]
+
+            cursor.close()
+
+        return result
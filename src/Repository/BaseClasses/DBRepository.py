@@ -1,5 +1,8 @@
 import sqlite3
+import threading
+from contextlib import contextmanager
 from sqlite3 import Error
+from typing import Callable
 
 from Enum.Color import Color
 from View.UserInterfaceFlow import UserInterfaceFlow
@@ -9,6 +12,13 @@ class DBRepository:
 
     dbFilename = "database.db"
 
+    # The connection of the active unit of work of each thread, every repository on that thread then shares its
+    # transaction
+    shared = threading.local()
+
+    # Pages copied per step of an online backup, other sessions can write in between the steps
+    BACKUP_PAGES = 256
+
     @staticmethod
     def create_connection():
         conn = None
@@ -21,4 +31,33 @@ class DBRepository:
                 1
             )
             exit(1)
-        return conn
\ No newline at end of file
+        return conn
+
+    @staticmethod
+    def backup(filename: str, progress: Callable[[int, int, int], object] = None):
+        # A consistent copy through the SQLite backup API, a write by another session during the copy makes it
+        # start over instead of capturing a torn state
+        source = DBRepository.create_connection()
+        target = sqlite3.connect(filename)
+
+        try:
+            source.backup(target, pages=DBRepository.BACKUP_PAGES, progress=progress)
+        finally:
+            target.close()
+            source.close()
+
+    @staticmethod
+    @contextmanager
+    def connection():
+        shared = getattr(DBRepository.shared, "connection", None)
+
+        if shared is not None:
+            yield shared
+            return
+
+        db = DBRepository.create_connection()
+        try:
+            yield db
+            db.commit()
+        finally:
+            db.close()
@@ -0,0 +1,115 @@
+from functools import lru_cache
+
+
+class ModelMapper:
+    __mappers = {}
+
+    def __init__(self, model_class):
+        self.model_class = model_class
+        self.table = model_class.TABLE_NAME
+
+        # Every annotated field of the model is a column, the id always comes first
+        annotations = {}
+        for base in reversed(model_class.__mro__):
+            annotations.update(getattr(base, "__annotations__", {}))
+
+        self.columns = ['id'] + [name for name in annotations if name != 'id']
+        self.encrypted = frozenset(model_class.ENCRYPTED_FIELDS)
+
+        insert_columns = self.columns[1:]
+        self.insert_columns = insert_columns
+        self.insert_sql = f"INSERT INTO {self.table} ({', '.join(insert_columns)}) " \
+                          f"VALUES ({', '.join('?' * len(insert_columns))})"
+        self.delete_sql = f"DELETE FROM {self.table} WHERE id = ?"
+
+    @staticmethod
+    def for_model(model_class) -> "ModelMapper":
+        mapper = ModelMapper.__mappers.get(model_class)
+
+        if mapper is None:
+            mapper = ModelMapper(model_class)
+            ModelMapper.__mappers[model_class] = mapper
+
+        return mapper
+
+    @lru_cache(maxsize=None)
+    def projection(self, fields: tuple = None) -> tuple:
+        if fields is None:
+            return tuple(self.columns)
+
+        for field in fields:
+            if field not in self.columns:
+                raise ValueError(f"Unknown {self.table} field '{field}'")
+
+        return ('id',) + tuple(field for field in fields if field != 'id')
+
+    @lru_cache(maxsize=256)
+    def select_sql(self, columns: tuple, clause: str = "") -> str:
+        return f"SELECT {', '.join(columns)} FROM {self.table} {clause}".strip()
+
+    @lru_cache(maxsize=None)
+    def update_sql(self, fields: tuple) -> str:
+        return f"UPDATE {self.table} SET {', '.join(map(lambda f: f'{f} = ?', fields))} WHERE id = ?"
+
+    @lru_cache(maxsize=None)
+    def __layout(self, columns: tuple) -> tuple:
+        # Positions of the plain and the encrypted columns within a row
+        plain = tuple((index, column) for index, column in enumerate(columns) if column not in self.encrypted)
+        encrypted = tuple((index, column) for index, column in enumerate(columns) if column in self.encrypted)
+
+        return plain, encrypted
+
+    def to_model(self, row, columns: tuple):
+        # Skips __init__ and the per field setattr, the ciphertexts are decrypted on first access
+        model = self.model_class.__new__(self.model_class)
+        model.__dict__["_ciphertexts"] = {}
+
+        self.__populate(model, row, columns)
+
+        return model
+
+    def populate_missing(self, model, row, columns: tuple):
+        # Adds the fields that are not loaded yet, loaded and changed values are kept
+        self.__populate(model, row, columns, lambda column: not model.is_loaded(column))
+
+    def __populate(self, model, row, columns: tuple, include=None):
+        plain, encrypted = self.__layout(columns)
+        values = model.__dict__
+        ciphertexts = values.setdefault("_ciphertexts", {})
+
+        for index, column in plain:
+            if include is None or include(column):
+                values[column] = row[index]
+
+        for index, column in encrypted:
+            if include is not None and not include(column):
+                continue
+
+            # An empty column has nothing to decrypt and counts as loaded and unchanged
+            if row[index] is None:
+                values[column] = None
+                values.setdefault("_original", {})[column] = None
+            else:
+                ciphertexts[column] = row[index]
+
+    def to_models(self, rows, columns: tuple, cache) -> list:
+        models = []
+
+        # One instance per id, rows of models that are already known only add their missing fields
+        for row in rows:
+            model = cache.models.get(row[0])
+
+            if model is None:
+                model = cache.put(self.to_model(row, columns))
+            else:
+                self.populate_missing(model, row, columns)
+
+            models.append(model)
+
+        return models
+
+    def insert_values(self, model) -> tuple:
+        return tuple(model.encrypted_values(self.insert_columns).values())
+
+    def update_values(self, model, fields: tuple) -> tuple:
+        return tuple(model.encrypted_values(list(fields)).values()) + (model.id,)
@@ -0,0 +1,80 @@
+from typing import Callable, Optional
+
+from Debug.ConsoleLogger import ConsoleLogger
+
+
+class RepositoryCache:
+    instances: list = []
+
+    def __init__(self, name: str):
+        self.name = name
+
+        # Identity map, one model instance per database id
+        self.models = {}
+
+        # Query results, stored as the list of ids they returned
+        self.queries = {}
+
+        self.hits = 0
+        self.misses = 0
+
+        RepositoryCache.instances.append(self)
+
+    def get(self, model_id: int, columns: list[str]):
+        model = self.models.get(model_id)
+
+        if model is None or not all(map(model.is_loaded, columns)):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return model
+
+    def put(self, model):
+        self.models[model.id] = model
+        return model
+
+    def get_query(self, key: tuple, columns: list[str]) -> Optional[list]:
+        ids = self.queries.get(key)
+
+        if ids is not None:
+            models = [self.models.get(model_id) for model_id in ids]
+
+            if all(map(lambda m: m is not None and all(map(m.is_loaded, columns)), models)):
+                self.hits += 1
+                ConsoleLogger.vvv("RepositoryCache %s: query hit %s, hit rate %.2f", self.name, key, self.hit_rate())
+                return models
+
+        self.misses += 1
+        return None
+
+    def put_query(self, key: tuple, models: list):
+        self.queries[key] = [model.id for model in models]
+
+    def evict(self, model_id: int):
+        self.models.pop(model_id, None)
+        self.invalidate_queries(lambda key, ids: model_id in ids)
+
+    def invalidate_queries(self, predicate: Callable[[tuple, list], bool] = None):
+        if predicate is None:
+            self.queries = {}
+            return
+
+        self.queries = {key: ids for key, ids in self.queries.items() if not predicate(key, ids)}
+
+    def clear(self):
+        self.models = {}
+        self.queries = {}
+
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total > 0 else 0.0
+
+    def stats(self) -> str:
+        return f"{self.name}: {self.hits} hits, {self.misses} misses, hit rate {self.hit_rate():.2f}, " \
+               f"{len(self.models)} models, {len(self.queries)} queries"
+
+    @staticmethod
+    def clear_all():
+        for cache in RepositoryCache.instances:
+            cache.clear()
@@ -0,0 +1,81 @@
+import threading
+from typing import Callable, Optional
+
+from Debug.ConsoleLogger import ConsoleLogger
+from Repository.BaseClasses.DBRepository import DBRepository
+from Repository.BaseClasses.RepositoryCache import RepositoryCache
+
+
+class UnitOfWork:
+    # The active unit of work of each thread, another thread (the log writer) never joins its transaction
+    local = threading.local()
+
+    def __init__(self):
+        self.connection = None
+        self.joined = False
+        self.buffers = {}
+        self.callbacks = []
+
+    def __enter__(self):
+        # A nested unit of work joins the active one
+        if UnitOfWork.current() is not None:
+            self.joined = True
+            return UnitOfWork.current()
+
+        self.connection = DBRepository.create_connection()
+
+        DBRepository.shared.connection = self.connection
+        UnitOfWork.local.current = self
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.joined:
+            return False
+
+        UnitOfWork.local.current = None
+        DBRepository.shared.connection = None
+
+        try:
+            if exc_type is not None:
+                ConsoleLogger.v("UnitOfWork: rolling back, %s: %s", exc_type.__name__, exc_value)
+                self.connection.rollback()
+
+                # Models in the identity map may hold changes that were never committed
+                RepositoryCache.clear_all()
+                return False
+
+            # All writes of the action are made durable with a single commit
+            self.connection.commit()
+        finally:
+            self.connection.close()
+
+        # Deferred work only runs once the transaction is committed
+        for flush, items in self.buffers.values():
+            flush(items)
+
+        for callback in self.callbacks:
+            callback()
+
+        return False
+
+    def buffer(self, name: str, flush: Callable[[list], None]) -> list:
+        if name not in self.buffers:
+            self.buffers[name] = (flush, [])
+
+        return self.buffers[name][1]
+
+    def after_commit(self, callback: Callable[[], None]):
+        self.callbacks.append(callback)
+
+    @staticmethod
+    def current() -> Optional["UnitOfWork"]:
+        return getattr(UnitOfWork.local, "current", None)
+
+    @staticmethod
+    def on_commit(callback: Callable[[], None]):
+        # Runs the callback once the active unit of work is committed, right away when there is none
+        if UnitOfWork.current() is not None:
+            UnitOfWork.current().after_commit(callback)
+        else:
+            callback()
@@ -0,0 +1,31 @@
+from typing import Optional
+
+from Debug.ConsoleLogger import ConsoleLogger
+from Repository.BaseClasses.DBRepository import DBRepository
+
+
+class ConfigRepository:
+
+    @staticmethod
+    def get(key: str) -> Optional[str]:
+        with DBRepository.connection() as db:
+            cursor = db.cursor()
+
+            cursor.execute("SELECT value FROM config WHERE key = ?", (key,))
+
+            result = cursor.fetchone()
+
+            cursor.close()
+
+        return result[0] if result is not None else None
+
+    @staticmethod
+    def set(key: str, value: str):
+        with DBRepository.connection() as db:
+            cursor = db.cursor()
+
+            cursor.execute("INSERT OR REPLACE INTO config (key, value) VALUES (?, ?)", (key, value))
+
+            cursor.close()
+
+        ConsoleLogger.vv("Config %s set to %s", key, value)
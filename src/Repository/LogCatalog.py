@@ -0,0 +1,183 @@
+import gzip
+import hashlib
+import json
+import os
+import shutil
+from bisect import bisect_left
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional
+
+from DTO.LogSegment import LogSegment
+
+
+class LogSegmentCorrupted(Exception):
+    # A closed segment no longer matches the checksum in the catalog, it was damaged or changed after rotating
+
+    def __init__(self, segment: LogSegment):
+        super().__init__(f"Checksum of log segment {segment.number} ({segment.filename}) does not match the catalog")
+        self.segment = segment
+
+
+class LogCatalog:
+    # The closed segments of the log with the sequence range, time range and checksum of each. The catalog is a
+    # small JSON file next to the segments and is reloaded whenever another process changed it
+
+    # Decompressed segments kept in memory while a reader pages through them
+    CACHE_SIZE = 4
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.filename = os.path.join(directory, "catalog.json")
+        self.segments: list[LogSegment] = []
+        self.version = None
+        self.cache: OrderedDict[int, bytes] = OrderedDict()
+
+    def load(self) -> list[LogSegment]:
+        try:
+            stat = os.stat(self.filename)
+            version = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            version = None
+
+        if version != self.version:
+            self.segments = LogCatalog.__read(self.filename) if version is not None else []
+            self.version = version
+            self.cache.clear()
+
+        return self.segments
+
+    def first_number(self) -> int:
+        segments = self.load()
+
+        return segments[0].number if len(segments) > 0 else self.active_number()
+
+    def active_number(self) -> int:
+        # The active segment gets the next number, so positions in it stay valid once it is closed
+        segments = self.load()
+
+        return segments[-1].number + 1 if len(segments) > 0 else 1
+
+    def last_sequence(self) -> int:
+        segments = self.load()
+
+        return segments[-1].lastSequence if len(segments) > 0 else 0
+
+    def find(self, sequence: int) -> Optional[LogSegment]:
+        # The closed segment holding the sequence number, None when it is in the active segment
+        segments = self.load()
+
+        position = bisect_left(segments, sequence, key=lambda segment: segment.lastSequence)
+
+        return segments[position] if position < len(segments) else None
+
+    def read(self, number: int) -> bytes:
+        if number in self.cache:
+            self.cache.move_to_end(number)
+            return self.cache[number]
+
+        segments = self.load()
+        segment = segments[number - segments[0].number]
+
+        with open(self.path(segment), "rb") as segment_file:
+            compressed = segment_file.read()
+
+        # An audit log that was changed is never shown or copied as if it was intact
+        if hashlib.sha256(compressed).hexdigest() != segment.checksum:
+            raise LogSegmentCorrupted(segment)
+
+        content = gzip.decompress(compressed)
+
+        self.cache[number] = content
+        if len(self.cache) > LogCatalog.CACHE_SIZE:
+            self.cache.popitem(last=False)
+
+        return content
+
+    def path(self, segment: LogSegment) -> str:
+        return os.path.join(self.directory, segment.filename)
+
+    def close_segment(self, filename: str, first_sequence: int, last_sequence: int, since: datetime,
+                      until: datetime) -> LogSegment:
+        # Compresses the active segment into the next numbered segment and adds it to the catalog, emptying the
+        # active segment is left to the caller
+        os.makedirs(self.directory, exist_ok=True)
+
+        number = self.active_number()
+        segment_filename = "log.%06d.csv.gz" % number
+        path = os.path.join(self.directory, segment_filename)
+
+        with open(filename, "rb") as source, gzip.open(path + ".tmp", "wb") as target:
+            shutil.copyfileobj(source, target)
+
+        checksum = LogCatalog.__checksum(path + ".tmp")
+        os.replace(path + ".tmp", path)
+
+        segment = LogSegment(number, segment_filename, first_sequence, last_sequence, since.isoformat(),
+                             until.isoformat(), checksum)
+
+        self.save(self.load() + [segment])
+
+        return segment
+
+    def save(self, segments: list[LogSegment]):
+        os.makedirs(self.directory, exist_ok=True)
+
+        LogCatalog.__write(self.filename + ".tmp", segments)
+        os.replace(self.filename + ".tmp", self.filename)
+
+    def backup(self, folder: str, store: str, segments: list[LogSegment]):
+        # Closed segments never change, so each is copied to the store once and shared by every backup after it.
+        # The backup itself only holds the catalog
+        os.makedirs(store, exist_ok=True)
+
+        for segment in segments:
+            stored = os.path.join(store, segment.checksum + ".csv.gz")
+
+            if not os.path.exists(stored):
+                if LogCatalog.__checksum(self.path(segment)) != segment.checksum:
+                    raise LogSegmentCorrupted(segment)
+
+                shutil.copy(self.path(segment), stored)
+
+        LogCatalog.__write(os.path.join(folder, "catalog.json"), segments)
+
+    def restore(self, folder: str, store: str):
+        # Backups made before the log was segmented have no catalog, their log is a single active segment
+        catalog_file = os.path.join(folder, "catalog.json")
+        segments = LogCatalog.__read(catalog_file) if os.path.exists(catalog_file) else []
+
+        # Only segments that differ from the ones already here are copied from the store. All of them are checked
+        # before anything is replaced, so a damaged store leaves the current log as it is
+        current = {segment.number: segment.checksum for segment in self.load()}
+
+        copies = [
+            segment for segment in segments
+            if current.get(segment.number) != segment.checksum or not os.path.exists(self.path(segment))
+        ]
+
+        for segment in copies:
+            if LogCatalog.__checksum(os.path.join(store, segment.checksum + ".csv.gz")) != segment.checksum:
+                raise LogSegmentCorrupted(segment)
+
+        os.makedirs(self.directory, exist_ok=True)
+
+        for segment in copies:
+            shutil.copy(os.path.join(store, segment.checksum + ".csv.gz"), self.path(segment))
+
+        self.save(segments)
+
+    @staticmethod
+    def __read(filename: str) -> list[LogSegment]:
+        with open(filename, "r") as catalog_file:
+            return [LogSegment.from_dict(values) for values in json.load(catalog_file)["segments"]]
+
+    @staticmethod
+    def __write(filename: str, segments: list[LogSegment]):
+        with open(filename, "w") as catalog_file:
+            json.dump({"segments": [segment.to_dict() for segment in segments]}, catalog_file, indent=2)
+
+    @staticmethod
+    def __checksum(filename: str) -> str:
+        with open(filename, "rb") as segment_file:
+            return hashlib.file_digest(segment_file, "sha256").hexdigest()
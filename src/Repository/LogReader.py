@@ -0,0 +1,257 @@
+import base64
+import io
+import os
+from bisect import bisect_right, insort
+
+from DTO.LogPage import LogPage
+from Repository.LogCatalog import LogCatalog
+from Service.EncryptionService import EncryptionService
+
+
+class LogReader:
+    # Reads pages of the log from its end, or around a position, without touching the rest of the log.
+    # Positions are (segment number, byte offset) pairs, pages continue into the neighbouring segments.
+    # Every line that gets decrypted anyway adds its sequence number and position to a sparse index,
+    # which narrows the binary search of later jumps
+
+    BLOCK_SIZE = 64 * 1024
+
+    # Below this span the binary search stops and the remaining lines are decrypted one after the other
+    SCAN_SIZE = 4 * 1024
+
+    def __init__(self, filename: str, catalog: LogCatalog):
+        self.filename = filename
+        self.catalog = catalog
+        self.index: dict[int, tuple[int, int]] = {}
+        self.sequences: list[int] = []
+        self.version = None
+
+    def latest(self, limit: int) -> LogPage:
+        return self.older(self.end(), limit)
+
+    def end(self) -> tuple[int, int]:
+        active = self.__active()
+
+        return active, self.__size(active)
+
+    def older(self, end: tuple[int, int], limit: int) -> LogPage:
+        first = self.catalog.first_number()
+        segment, offset = end
+
+        lines = self.__lines_before(segment, offset, limit)
+        while len(lines) < limit and segment > first:
+            segment -= 1
+            lines = self.__lines_before(segment, self.__size(segment), limit - len(lines)) + lines
+
+        return self.__page(lines, end)
+
+    def newer(self, start: tuple[int, int], limit: int) -> LogPage:
+        active = self.__active()
+        segment, offset = start
+
+        lines = self.__lines_from(segment, offset, limit)
+        while len(lines) < limit and segment < active:
+            segment += 1
+            lines += self.__lines_from(segment, 0, limit - len(lines))
+
+        return self.__page(lines, start)
+
+    def has_newer(self, position: tuple[int, int]) -> bool:
+        # Only the active segment and its size are compared with the position, a closed segment is only read
+        # when the position is in it
+        segment, offset = position
+        active = self.__active()
+
+        while segment < active and offset >= self.__size(segment):
+            segment, offset = segment + 1, 0
+
+        return offset < self.__size(segment)
+
+    def has_older(self, page: LogPage) -> bool:
+        return page.start[1] > 0 or page.start[0] > self.catalog.first_number()
+
+    def at_sequence(self, sequence: int, limit: int) -> LogPage:
+        # The page starting at the line with the sequence number, or the first line after it
+        closed = self.catalog.find(sequence)
+        segment = closed.number if closed is not None else self.__active()
+
+        return self.newer((segment, self.__find_offset(segment, sequence)), limit)
+
+    def __page(self, lines: list[tuple[int, int, bytes]], position: tuple[int, int]) -> LogPage:
+        if len(lines) == 0:
+            return LogPage([], position, position)
+
+        decrypted = []
+        for segment, offset, raw in lines:
+            line = EncryptionService.decrypt(base64.b64decode(raw))
+            self.__remember(int(line.split(",")[0]), (segment, offset))
+            decrypted.append(line)
+
+        first_segment, first_offset, _ = lines[0]
+        last_segment, last_offset, last_raw = lines[-1]
+
+        return LogPage(decrypted, (first_segment, first_offset), (last_segment, last_offset + len(last_raw) + 1))
+
+    def __find_offset(self, segment: int, sequence: int) -> int:
+        # Bounded by the closest known lines around the sequence number within the segment
+        low, high = 0, self.__size(segment)
+        position = bisect_right(self.sequences, sequence)
+        if position > 0:
+            known_segment, known_offset = self.index[self.sequences[position - 1]]
+            if known_segment == segment:
+                if self.sequences[position - 1] == sequence:
+                    return known_offset
+                low = known_offset
+        if position < len(self.sequences):
+            known_segment, known_offset = self.index[self.sequences[position]]
+            if known_segment == segment:
+                high = known_offset
+
+        with self.__open(segment) as log_file:
+            # Binary search on byte offsets, every probe decrypts a single line
+            while high - low > self.SCAN_SIZE:
+                log_file.seek((low + high) // 2)
+                log_file.readline()
+
+                offset = log_file.tell()
+                raw = log_file.readline().rstrip(b"\n")
+
+                if offset >= high or raw == b"":
+                    break
+
+                probe = int(EncryptionService.decrypt(base64.b64decode(raw)).split(",")[0])
+                self.__remember(probe, (segment, offset))
+
+                if probe < sequence:
+                    low = offset + len(raw) + 1
+                else:
+                    high = offset
+
+            # The remaining span is scanned line by line
+            log_file.seek(low)
+            if low > 0:
+                log_file.seek(low - 1)
+                if log_file.read(1) != b"\n":
+                    log_file.readline()
+
+            while log_file.tell() < high:
+                offset = log_file.tell()
+                raw = log_file.readline().rstrip(b"\n")
+
+                if raw == b"":
+                    break
+
+                probe = int(EncryptionService.decrypt(base64.b64decode(raw)).split(",")[0])
+                self.__remember(probe, (segment, offset))
+
+                if probe >= sequence:
+                    return offset
+
+        return high
+
+    def __lines_before(self, segment: int, end: int, limit: int) -> list[tuple[int, int, bytes]]:
+        # Reads backwards in blocks until the limit of complete lines before end is reached
+        with self.__open(segment) as log_file:
+            position = end
+            buffer = b""
+
+            while position > 0 and buffer.count(b"\n") <= limit:
+                read = min(self.BLOCK_SIZE, position)
+                position -= read
+
+                log_file.seek(position)
+                buffer = log_file.read(read) + buffer
+
+        # The first line in the buffer is only complete when the start of the segment was reached
+        if position > 0:
+            cut = buffer.index(b"\n") + 1
+            position += cut
+            buffer = buffer[cut:]
+
+        return LogReader.__split(segment, buffer, position)[-limit:]
+
+    def __lines_from(self, segment: int, start: int, limit: int) -> list[tuple[int, int, bytes]]:
+        lines = []
+
+        with self.__open(segment) as log_file:
+            log_file.seek(start)
+
+            while len(lines) < limit:
+                offset = log_file.tell()
+                raw = log_file.readline()
+
+                if not raw.endswith(b"\n"):
+                    break
+
+                lines.append((segment, offset, raw[:-1]))
+
+        return lines
+
+    @staticmethod
+    def __split(segment: int, buffer: bytes, offset: int) -> list[tuple[int, int, bytes]]:
+        lines = []
+
+        for raw in buffer.split(b"\n"):
+            if raw != b"":
+                lines.append((segment, offset, raw))
+            offset += len(raw) + 1
+
+        return lines
+
+    def __remember(self, sequence: int, position: tuple[int, int]):
+        if sequence not in self.index:
+            insort(self.sequences, sequence)
+        self.index[sequence] = position
+
+    def __open(self, segment: int):
+        # Closed segments are read from their decompressed content, the active segment from the file itself
+        if segment == self.__active():
+            return open(self.filename, "rb")
+
+        return io.BytesIO(self.catalog.read(segment))
+
+    def __size(self, segment: int) -> int:
+        if segment == self.__active():
+            return self.__complete_size()
+
+        return len(self.catalog.read(segment))
+
+    def __complete_size(self) -> int:
+        # Another process can be appending to the active segment, a last line without its newline is not part of
+        # the log yet. Every read stops at this size, so a partly written line is never decrypted
+        with open(self.filename, "rb") as log_file:
+            position = log_file.seek(0, os.SEEK_END)
+
+            if position == 0:
+                return 0
+
+            log_file.seek(position - 1)
+            if log_file.read(1) == b"\n":
+                return position
+
+            while position > 0:
+                read = min(self.BLOCK_SIZE, position)
+                position -= read
+
+                log_file.seek(position)
+                newline = log_file.read(read).rfind(b"\n")
+
+                if newline >= 0:
+                    return position + newline + 1
+
+        return 0
+
+    def __active(self) -> int:
+        if not os.path.exists(self.filename):
+            open(self.filename, "a").close()
+
+        active = self.catalog.active_number()
+        version = (os.stat(self.filename).st_ino, self.catalog.version)
+
+        # A rotated or replaced log (a restored backup) makes the known positions unreliable
+        if version != self.version:
+            self.index = {}
+            self.sequences = []
+            self.version = version
+
+        return active
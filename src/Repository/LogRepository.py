@@ -1,8 +1,30 @@
+import atexit
 import base64
-from datetime import datetime
+import os
+import re
+import shutil
+import sqlite3
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from queue import Queue, Empty
+from threading import Thread
+from typing import Optional
 
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+from DTO.LogFilter import LogFilter
 from Debug.ConsoleLogger import ConsoleLogger
 from Enum.LogType import LogType
+from Repository.BaseClasses.DBRepository import DBRepository
+from Repository.BaseClasses.UnitOfWork import UnitOfWork
+from Repository.LogCatalog import LogCatalog
+from Repository.LogReader import LogReader
+from Security.ActivityAggregator import ActivityAggregator
 from Security.SecurityHelper import SecurityHelper
 from Service.EncryptionService import EncryptionService
 
@@ -10,52 +32,609 @@ from Service.EncryptionService import EncryptionService
 class LogRepository:
     # TODO: OWASP logging?
 
+    # The active segment, closed segments are compressed into the log directory and listed in its catalog
     logFilename = "log.csv"
+    logDirectory = "Logs"
 
-    @staticmethod
-    def log(log_type: LogType, additional_message: str = ""):
-        log_file = open(LogRepository.logFilename, "a")
+    # Closed segments are shared by all backups, see backup
+    segmentStore = "Backups/Segments"
+
+    # The active segment is closed once it reaches either limit, keeping appends and tail reads cheap
+    SEGMENT_SIZE = 256 * 1024
+    SEGMENT_AGE = timedelta(days=1)
+
+    # Append handle kept open between writes, see __open
+    logFile = None
+
+    # Held while appending, see __lock
+    lockFilename = "log.lock"
+    lockFile = None
+
+    # Sequence number of the last line and the size of the log right after it was written
+    sequence: int = None
+    logSize: int = None
+
+    # Time of the first line in the active segment
+    segmentStarted: datetime = None
+
+    logCatalog: LogCatalog = None
+
+    # Entries are encrypted and appended in batches by a background writer, off the interactive path.
+    # A batch is written once it is full, FLUSH_INTERVAL seconds after its first entry or on flush()
+    QUEUE_SIZE = 1024
+    BATCH_SIZE = 64
+    FLUSH_INTERVAL = 0.5
+
+    # Suspicious entries are written before log() returns
+    SYNC_SUSPICIOUS = True
+
+    queue: Queue = None
+    writer: Thread = None
 
-        count = LogRepository.__get_log_length()
+    # Keeps its sparse offset index between reads, see reader
+    logReader: LogReader = None
 
-        date = datetime.now().strftime("%d-%m-%Y")
-        time = datetime.now().strftime("%H:%M:%S")
+    # A failed write is tried again after a short delay before it is reported
+    WRITE_ATTEMPTS = 3
+    WRITE_RETRY_DELAY = 0.2
 
+    # Entries that could not be appended, and appended batches that could not be stored in the log table. Both are
+    # written before the next batch, so a failure delays entries instead of dropping them
+    unwritten: list = []
+    unstored: list = []
+
+    # Entries logged while nobody is logged in name the account they are about in their message
+    SUBJECT_PATTERN = re.compile("username: “([^”]*)”")
+
+    __FLUSH = object()
+
+    @staticmethod
+    def log(log_type: LogType, additional_message: str = "", sync: bool = None, subject: str = None):
+        # The subject is the account the entry is about, the logged-in user unless given. Failed logins happen before
+        # anyone is logged in and pass the username that was tried
         username = SecurityHelper.get_logged_in_user().username \
             if SecurityHelper.get_logged_in_user() is not None else "---"
 
-        suspicous = "Ja" if log_type.value.suspicious else "Nee"
+        if sync is None:
+            sync = log_type.value.suspicious and LogRepository.SYNC_SUSPICIOUS
 
-        log_line = f"{count + 1},{date},{time},{username},{log_type.value.message},{additional_message},{suspicous}"
+        entry = (datetime.now(), username, log_type, additional_message, sync, subject or username)
 
-        ConsoleLogger.v(log_line)
+        # Inside a unit of work the entry is queued once the transaction is committed
+        if UnitOfWork.current() is not None:
+            UnitOfWork.current().buffer("log", LogRepository.__enqueue).append(entry)
+            return
 
-        log_line_encrypted = EncryptionService.encrypt(log_line)
+        LogRepository.__enqueue([entry])
 
-        log_file.write(base64.b64encode(log_line_encrypted).decode('utf-8') + "\n")
-        log_file.close()
+    @staticmethod
+    def flush():
+        # Blocks until every entry logged so far is written
+        if LogRepository.writer is None:
+            return
+
+        LogRepository.queue.put(LogRepository.__FLUSH)
+        LogRepository.queue.join()
+
+    @staticmethod
+    def __enqueue(entries: list):
+        LogRepository.__start_writer()
+
+        # The queue is bounded, when the writer falls behind logging waits instead of dropping entries
+        for entry in entries:
+            LogRepository.queue.put(entry)
+
+        if any(entry[4] for entry in entries):
+            LogRepository.flush()
+
+    @staticmethod
+    def __start_writer():
+        if LogRepository.writer is not None:
+            return
+
+        LogRepository.queue = Queue(maxsize=LogRepository.QUEUE_SIZE)
+        LogRepository.writer = Thread(target=LogRepository.__run_writer, name="LogWriter", daemon=True)
+        LogRepository.writer.start()
+
+        # Daemon threads still run during exit handlers, so the queued entries are written on a normal shutdown
+        atexit.register(LogRepository.flush)
+
+    @staticmethod
+    def __run_writer():
+        log_queue = LogRepository.queue
+
+        while True:
+            batch = [log_queue.get()]
+            received = 1
+
+            deadline = time.monotonic() + LogRepository.FLUSH_INTERVAL
+            while batch[-1] is not LogRepository.__FLUSH and len(batch) < LogRepository.BATCH_SIZE:
+                try:
+                    batch.append(log_queue.get(timeout=max(deadline - time.monotonic(), 0)))
+                    received += 1
+                except Empty:
+                    break
+
+            entries = [entry for entry in batch if entry is not LogRepository.__FLUSH]
+
+            try:
+                if len(entries) > 0:
+                    LogRepository.__write(entries)
+            except Exception as e:
+                # Shown even when not verbose, audit entries are waiting to be written
+                sys.stderr.write(f"LogRepository: writing log entries failed, {len(LogRepository.unwritten)} not "
+                                 f"appended and {len(LogRepository.unstored)} batches not stored yet: {e}\n")
+            finally:
+                for _ in range(received):
+                    log_queue.task_done()
+
+    @staticmethod
+    def __write(entries: list):
+        entries = LogRepository.unwritten + entries
+        LogRepository.unwritten = []
+
+        try:
+            rows = LogRepository.__retry(LogRepository.__append_locked, entries)
+        except Exception:
+            # A batch is appended with a single write, so none of the entries are in the log yet
+            LogRepository.unwritten = entries
+            raise
+
+        # The lines are in the log file now. index_log only adds lines after the last stored one, so a batch that is
+        # not stored stays queued until it is
+        LogRepository.unstored.append((rows, entries))
+
+        flags = []
+        while len(LogRepository.unstored) > 0:
+            flags += LogRepository.__retry(LogRepository.__store, *LogRepository.unstored[0])
+            LogRepository.unstored.pop(0)
+
+        # Entries raised by the aggregator are written right away, they are never flagged themselves
+        if len(flags) > 0:
+            LogRepository.__write(flags)
+
+    @staticmethod
+    def __retry(action, *args):
+        for attempt in range(1, LogRepository.WRITE_ATTEMPTS + 1):
+            try:
+                return action(*args)
+            except Exception as e:
+                if attempt == LogRepository.WRITE_ATTEMPTS:
+                    raise
+
+                ConsoleLogger.v("LogRepository: attempt %d of writing the log failed: %s", attempt, e)
+                time.sleep(LogRepository.WRITE_RETRY_DELAY)
+
+    @staticmethod
+    def __append_locked(entries: list) -> list[tuple]:
+        with LogRepository.__lock():
+            return LogRepository.__append(entries)
+
+    @staticmethod
+    def __append(entries: list) -> list[tuple]:
+        # Runs under the log lock, so the sequence numbers are read, allocated and appended by one process at a time
+        log_file = LogRepository.__open()
+
+        if LogRepository.__segment_expired(log_file, entries[0][0]):
+            LogRepository.__rotate()
+            log_file = LogRepository.__open()
+
+        # Anyone else appending (or a restored backup) changes the size, only then the last line is read again
+        if LogRepository.sequence is None or os.fstat(log_file.fileno()).st_size != LogRepository.logSize:
+            LogRepository.sequence = LogRepository.__read_last_sequence()
+
+        if os.fstat(log_file.fileno()).st_size == 0:
+            LogRepository.segmentStarted = entries[0][0]
+
+        count = LogRepository.sequence
+
+        lines = []
+        rows = []
+
+        for now, username, log_type, additional_message, _, subject in entries:
+            count += 1
+
+            date = now.strftime("%d-%m-%Y")
+            time_text = now.strftime("%H:%M:%S")
+
+            suspicous = "Ja" if log_type.value.suspicious else "Nee"
+
+            log_line = f"{count},{date},{time_text},{username},{log_type.value.message},{additional_message}," \
+                       f"{suspicous}"
+
+            ConsoleLogger.v(log_line)
+
+            log_line_encrypted = EncryptionService.encrypt(log_line)
+
+            lines.append(base64.b64encode(log_line_encrypted) + b"\n")
+
+            rows.append(LogRepository.__row(count, now, subject, log_type.name, log_type.value.suspicious,
+                                             log_line_encrypted))
+
+        # The batch is appended with a single unbuffered write
+        log_file.write(b"".join(lines))
+
+        LogRepository.sequence = count
+        LogRepository.logSize = os.fstat(log_file.fileno()).st_size
+
+        if LogRepository.logSize >= LogRepository.SEGMENT_SIZE:
+            LogRepository.__rotate()
+
+        return rows
+
+    @staticmethod
+    def __segment_expired(log_file, now: datetime) -> bool:
+        if os.fstat(log_file.fileno()).st_size == 0:
+            return False
+
+        if LogRepository.segmentStarted is None:
+            LogRepository.segmentStarted = LogRepository.__line_time(LogRepository.__read_first_line())
+
+        return now - LogRepository.segmentStarted >= LogRepository.SEGMENT_AGE
+
+    @staticmethod
+    def __rotate():
+        first = LogRepository.__read_first_line()
+        last = LogRepository.__read_last_line()
+
+        segment = LogRepository.catalog().close_segment(
+            LogRepository.logFilename,
+            int(first[0]),
+            int(last[0]),
+            LogRepository.__line_time(first),
+            LogRepository.__line_time(last)
+        )
+
+        # Emptied only once the catalog is saved, a crash in between leaves lines in both instead of losing them.
+        # The new file has another inode, so the append handle is reopened on the next write
+        empty = LogRepository.logFilename + ".tmp"
+        open(empty, "w").close()
+        os.replace(empty, LogRepository.logFilename)
+
+        LogRepository.segmentStarted = None
+
+        ConsoleLogger.v("Log segment %d closed: lines %d to %d", segment.number, segment.firstSequence,
+                        segment.lastSequence)
+
+    @staticmethod
+    def catalog() -> LogCatalog:
+        if LogRepository.logCatalog is None:
+            LogRepository.logCatalog = LogCatalog(LogRepository.logDirectory)
+
+        return LogRepository.logCatalog
+
+    @staticmethod
+    def __row(sequence: int, now: datetime, subject: str, log_type: str, suspicious: bool, payload: bytes) -> tuple:
+        # Next to the encrypted line only coarse metadata is stored, the day and a blind index of the subject, so
+        # failed logins are found under the username that was tried
+        return (
+            sequence,
+            now.strftime("%Y-%m-%d"),
+            log_type,
+            1 if suspicious else 0,
+            EncryptionService.blind_index(subject.lower(), "log_username"),
+            payload
+        )
+
+    @staticmethod
+    def __store(rows: list[tuple], entries: list = None) -> list:
+        # The writer thread has its own connection, the connection of a unit of work belongs to another thread.
+        # New entries are counted by the activity aggregator in the same transaction, indexed old lines are not
+        db = DBRepository.create_connection()
+
+        try:
+            cursor = db.cursor()
+
+            cursor.executemany(
+                "INSERT OR IGNORE INTO log (sequence, day, logType, suspicious, userHash, payload) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+
+            flags = ActivityAggregator.observe(cursor, entries) if entries is not None else []
+
+            cursor.close()
+
+            db.commit()
+        finally:
+            db.close()
+
+        return flags
+
+    @staticmethod
+    @contextmanager
+    def __lock():
+        # Advisory lock shared by every session in the working directory. It is a separate file, because rotating
+        # replaces the log itself. Without fcntl (Windows) appends are only safe within one session
+        if fcntl is None:
+            yield
+            return
+
+        if LogRepository.lockFile is None:
+            LogRepository.lockFile = open(LogRepository.lockFilename, "a")
+
+        fcntl.flock(LogRepository.lockFile.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(LogRepository.lockFile.fileno(), fcntl.LOCK_UN)
+
+    @staticmethod
+    def __open():
+        log_file = LogRepository.logFile
+
+        try:
+            inode = os.stat(LogRepository.logFilename).st_ino
+        except FileNotFoundError:
+            inode = None
+
+        # Reopened when the log was removed or replaced since it was opened
+        if log_file is None or inode != os.fstat(log_file.fileno()).st_ino:
+            if log_file is not None:
+                log_file.close()
+
+            LogRepository.logFile = open(LogRepository.logFilename, "ab", buffering=0)
+            LogRepository.sequence = None
+            LogRepository.segmentStarted = None
+
+        return LogRepository.logFile
 
     @staticmethod
     def find_all() -> list[str]:
-        log_file = open(LogRepository.logFilename, "r") # TODO: Handle not exist
+        LogRepository.flush()
 
-        logs = []
+        return [EncryptionService.decrypt(base64.b64decode(line)) for line in LogRepository.__lines()]
 
-        for line in log_file:
-            logs.append(EncryptionService.decrypt(base64.b64decode(line)))
+    @staticmethod
+    def reader() -> LogReader:
+        # Everything logged so far is written before the log is read
+        LogRepository.flush()
 
-        log_file.close()
+        if LogRepository.logReader is None:
+            LogRepository.logReader = LogReader(LogRepository.logFilename, LogRepository.catalog())
+
+        return LogRepository.logReader
+
+    @staticmethod
+    def find_filtered(log_filter: LogFilter, offset: int, limit: int) -> list[str]:
+        # Newest first, only the rows of the page are decrypted
+        LogRepository.flush()
+
+        clauses = []
+        params = []
+
+        if log_filter.username is not None:
+            clauses.append("userHash = ?")
+            params.append(EncryptionService.blind_index(log_filter.username.lower(), "log_username"))
+
+        if log_filter.since is not None:
+            clauses.append("day >= ?")
+            params.append(log_filter.since.isoformat())
+
+        if log_filter.until is not None:
+            clauses.append("day <= ?")
+            params.append(log_filter.until.isoformat())
+
+        if log_filter.logTypes is not None:
+            clauses.append("logType IN (%s)" % ','.join('?' * len(log_filter.logTypes)))
+            params += log_filter.logTypes
 
-        return logs
+        if log_filter.suspicious is not None:
+            clauses.append("suspicious = ?")
+            params.append(1 if log_filter.suspicious else 0)
+
+        where = " WHERE " + " AND ".join(clauses) if len(clauses) > 0 else ""
+
+        with DBRepository.connection() as db:
+            cursor = db.cursor()
+
+            cursor.execute(f"SELECT payload FROM log{where} ORDER BY sequence DESC LIMIT ? OFFSET ?",
+                           params + [limit, offset])
+
+            result = cursor.fetchall()
+
+            cursor.close()
+
+        return [EncryptionService.decrypt(row[0]) for row in result]
+
+    @staticmethod
+    def index_log():
+        # Fills the log table with the lines written before it existed, decrypting them once
+        if not os.path.exists(LogRepository.logFilename):
+            return
+
+        with DBRepository.connection() as db:
+            cursor = db.cursor()
+
+            cursor.execute("SELECT COALESCE(MAX(sequence), 0) FROM log")
+            indexed = cursor.fetchone()[0]
+
+            cursor.close()
+
+        if indexed >= LogRepository.__read_last_sequence():
+            return
+
+        ConsoleLogger.v("Indexing log")
+
+        # The message is shared by some types, the suspicious flag tells most of them apart
+        log_types = {}
+        for log_type in LogType:
+            log_types.setdefault((log_type.value.message, log_type.value.suspicious), log_type.name)
+
+        rows = []
+
+        # Segments that were indexed completely are skipped without decrypting them
+        for line in LogRepository.__lines(indexed):
+            payload = base64.b64decode(line)
+            fields = EncryptionService.decrypt(payload).split(",")
+
+            suspicious = fields[-1] == "Ja"
+
+            rows.append(LogRepository.__row(
+                int(fields[0]),
+                datetime.strptime(fields[1], "%d-%m-%Y"),
+                LogRepository.__subject(fields),
+                log_types.get((fields[4], suspicious), fields[4]),
+                suspicious,
+                payload
+            ))
+
+        LogRepository.__store(rows)
+
+    @staticmethod
+    def __subject(fields: list[str]) -> str:
+        # The subject an entry was logged with, read back from its line
+        match = LogRepository.SUBJECT_PATTERN.search(",".join(fields[5:-1])) if fields[3] == "---" else None
+
+        return match.group(1) if match is not None else fields[3]
+
+    @staticmethod
+    def __lines(after: int = 0):
+        # The encoded lines of the closed segments holding lines after the given sequence number, then the active one
+        catalog = LogRepository.catalog()
+
+        for segment in catalog.load():
+            if segment.lastSequence > after:
+                yield from catalog.read(segment.number).splitlines()
+
+        if os.path.exists(LogRepository.logFilename):
+            with open(LogRepository.logFilename, "rb") as log_file:
+                for line in log_file:
+                    yield line.rstrip(b"\n")
+
+    @staticmethod
+    def backup(folder: str, sequence: int = None):
+        # The backup holds the log up to and including the sequence number, everything when it is None. The closed
+        # segments before that line go to the segment store, the part of the segment holding it is the active segment
+        reader = LogRepository.reader()
+
+        if sequence is not None:
+            segment, offset = reader.at_sequence(sequence + 1, 1).start
+        else:
+            segment, offset = reader.end()
+
+        catalog = LogRepository.catalog()
+
+        # Positions stay valid when the segment is closed meanwhile, the lock only keeps it from being closed while
+        # it is copied
+        with LogRepository.__lock():
+            catalog.backup(folder, LogRepository.segmentStore,
+                           [closed for closed in catalog.load() if closed.number < segment])
+
+            if segment == catalog.active_number():
+                with open(LogRepository.logFilename, "rb") as log_file:
+                    content = log_file.read(offset)
+            else:
+                content = catalog.read(segment)[:offset]
+
+        with open(os.path.join(folder, LogRepository.logFilename), "wb") as backup_file:
+            backup_file.write(content)
+
+    @staticmethod
+    def stored_sequence(filename: str) -> int:
+        # The last log entry stored in the database file, a copy made by a backup included
+        db = sqlite3.connect(filename)
+
+        try:
+            return db.execute("SELECT COALESCE(MAX(sequence), 0) FROM log").fetchone()[0]
+        finally:
+            db.close()
+
+    @staticmethod
+    def restore(folder: str):
+        LogRepository.flush()
+
+        with LogRepository.__lock():
+            LogRepository.catalog().restore(folder, LogRepository.segmentStore)
+
+            # Replaced instead of overwritten, the new inode makes other processes reopen the log and drop what they
+            # knew about the previous active segment
+            restored = LogRepository.logFilename + ".tmp"
+            shutil.copy(os.path.join(folder, LogRepository.logFilename), restored)
+            os.replace(restored, LogRepository.logFilename)
+
+            # The age of the restored segment is measured from its own first line
+            first = LogRepository.__read_first_line()
+
+            LogRepository.sequence = None
+            LogRepository.segmentStarted = LogRepository.__line_time(first) if first is not None else None
+
+    @staticmethod
+    def __read_last_sequence() -> int:
+        try:
+            fields = LogRepository.__read_last_line()
+
+            # An empty active segment continues after the last closed segment
+            if fields is None:
+                return LogRepository.catalog().last_sequence()
+
+            return int(fields[0])
+        except ValueError:
+            ConsoleLogger.v("LogRepository: last line of the log is unreadable, counting the lines")
+            return LogRepository.__get_log_length()
+
+    @staticmethod
+    def __read_first_line() -> Optional[list[str]]:
+        with open(LogRepository.logFilename, "rb") as log_file:
+            line = log_file.readline().strip()
+
+        if line == b"":
+            return None
+
+        return EncryptionService.decrypt(base64.b64decode(line)).split(",")
+
+    @staticmethod
+    def __read_last_line() -> Optional[list[str]]:
+        # Reads the last line by seeking back from the end, so the cost does not depend on the size of the log
+        with open(LogRepository.logFilename, "rb") as log_file:
+            end = log_file.seek(0, os.SEEK_END)
+
+            chunk = b""
+            position = end
+            while position > 0 and chunk.strip().count(b"\n") == 0:
+                position = max(position - 1024, 0)
+                log_file.seek(position)
+                chunk = log_file.read(end - position)
+
+        lines = chunk.strip().split(b"\n")
+
+        if lines[-1] == b"":
+            return None
+
+        return EncryptionService.decrypt(base64.b64decode(lines[-1])).split(",")
+
+    @staticmethod
+    def __line_time(fields: list[str]) -> datetime:
+        return datetime.strptime(f"{fields[1]} {fields[2]}", "%d-%m-%Y %H:%M:%S")
 
     @staticmethod
     def __get_log_length() -> int:
+        # Sequence numbers are contiguous, so only the lines of the active segment are counted
         log_file = open(LogRepository.logFilename, "r")
 
         count = 0
-        for count, line in enumerate(log_file):
+        for count, line in enumerate(log_file, 1):
             pass
 
         log_file.close()
 
-        return count
+        return LogRepository.catalog().last_sequence() + count
+
+    @staticmethod
+    def after_fork():
+        # A forked process has none of the threads of its parent, and a lock taken through an open file it shares with
+        # its parent would not exclude the parent. Both are started or opened again on the first write, entries still
+        # waiting to be written belong to the parent
+        LogRepository.queue = None
+        LogRepository.writer = None
+        LogRepository.logFile = None
+        LogRepository.lockFile = None
+        LogRepository.sequence = None
+        LogRepository.logReader = None
+        LogRepository.unwritten = []
+        LogRepository.unstored = []
+
+
+# Sessions started with multiprocessing (fork) get a writer and log handles of their own
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=LogRepository.after_fork)
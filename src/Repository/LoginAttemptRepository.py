@@ -0,0 +1,80 @@
+from Repository.BaseClasses.DBRepository import DBRepository
+
+
+class LoginAttemptRepository:
+
+    @staticmethod
+    def count_since(key: str, since: float) -> int:
+        with DBRepository.connection() as db:
+            cursor = db.cursor()
+
+            cursor.execute("SELECT COUNT(*) FROM login_attempt WHERE key = ? AND attemptedAt > ?", (key, since))
+
+            result = cursor.fetchone()
+
+            cursor.close()
+
+        return result[0]
+
+    @staticmethod
+    def add(keys: list[str], attempted_at: float):
+        with DBRepository.connection() as db:
+            cursor = db.cursor()
+
+            cursor.executemany(
+                "INSERT INTO login_attempt (key, attemptedAt) VALUES (?, ?)",
+                [(key, attempted_at) for key in keys]
+            )
+
+            cursor.close()
+
+    @staticmethod
+    def clear(key: str):
+        with DBRepository.connection() as db:
+            cursor = db.cursor()
+
+            cursor.execute("DELETE FROM login_attempt WHERE key = ?", (key,))
+
+            cursor.close()
+
+    @staticmethod
+    def prune(before: float):
+        with DBRepository.connection() as db:
+            cursor = db.cursor()
+
+            cursor.execute("DELETE FROM login_attempt WHERE attemptedAt <= ?", (before,))
+
+            cursor.close()
+
+    @staticmethod
+    def block(key: str, blocked_at: float) -> int:
+        # Returns the number of attempts blocked for the key since it got blocked
+        with DBRepository.connection() as db:
+            cursor = db.cursor()
+
+            cursor.execute(
+                "INSERT INTO login_block (key, blocked, since) VALUES (?, 1, ?) "
+                "ON CONFLICT(key) DO UPDATE SET blocked = blocked + 1 "
+                "RETURNING blocked",
+                (key, blocked_at)
+            )
+
+            result = cursor.fetchone()
+
+            cursor.close()
+
+        return result[0]
+
+    @staticmethod
+    def release(key: str) -> int:
+        # Returns the number of attempts that were blocked, 0 if the key was not blocked
+        with DBRepository.connection() as db:
+            cursor = db.cursor()
+
+            cursor.execute("DELETE FROM login_block WHERE key = ? RETURNING blocked", (key,))
+
+            result = cursor.fetchone()
+
+            cursor.close()
+
+        return result[0] if result is not None else 0
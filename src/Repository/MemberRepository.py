@@ -1,37 +1,146 @@
 import random
 from datetime import datetime
+from functools import partial
+from typing import Optional
 
 from Debug.ConsoleLogger import ConsoleLogger
 from Models.Member import Member
 from Repository.BaseClasses.DBRepository import DBRepository
+from Repository.BaseClasses.ModelMapper import ModelMapper
+from Repository.BaseClasses.RepositoryCache import RepositoryCache
+from Repository.BaseClasses.UnitOfWork import UnitOfWork
+from Service.EncryptionService import EncryptionService
 from Service.IndexService import IndexService
 
 
 class MemberRepository:
+    cache = RepositoryCache("member")
+    mapper = ModelMapper.for_model(Member)
+
+    PAGE_SIZE = 20
+
+    # The member number is generated once and never updated
+    UPDATE_FIELDS = ['firstName', 'lastName', 'age', 'weight', 'gender', 'streetName', 'houseNumber', 'city',
+                     'zipCode', 'emailAddress', 'phoneNumber']
+
+    # The fields rendered by the member overview
+    OVERVIEW_FIELDS = ['number', 'firstName', 'lastName', 'age', 'emailAddress', 'streetName', 'houseNumber']
+
+    @staticmethod
+    def find_all(ids: list[int] = None, fields: list[str] = None) -> list[Member]:
+        columns = MemberRepository.__columns(fields)
+
+        if ids is None:
+            return MemberRepository.__query(("all", columns), MemberRepository.mapper.select_sql(columns), (), columns)
+
+        # Members in the identity map are served from memory, only the others are fetched
+        cache = MemberRepository.cache
+        cached = {}
+        for member_id in ids:
+            member = cache.get(member_id, columns)
+            if member is not None:
+                cached[member_id] = member
+
+        missing = [member_id for member_id in ids if member_id not in cached]
+
+        if len(missing) > 0:
+            with DBRepository.connection() as db:
+                cursor = db.cursor()
+
+                cursor.execute(
+                    MemberRepository.mapper.select_sql(columns, "WHERE id IN (%s)" % ','.join('?' * len(missing))),
+                    missing
+                )
+
+                result = cursor.fetchall()
+
+                cursor.close()
+
+            for member in MemberRepository.mapper.to_models(result, columns, cache):
+                cached[member.id] = member
+
+        return [cached[member_id] for member_id in sorted(cached)]
 
     @staticmethod
-    def find_all(ids: list[int] = None) -> list[Member]:
-        db = DBRepository.create_connection()
-        cursor = db.cursor()
+    def find_by_id(member_id: int) -> Optional[Member]:
+        members = MemberRepository.find_all([member_id])
 
-        if ids is not None:
-            cursor.execute('SELECT * FROM member WHERE id IN (%s)' % ','.join('?' * len(ids)), ids)
-        else:
-            cursor.execute("SELECT * FROM member")
+        return members[0] if len(members) > 0 else None
 
-        result = cursor.fetchall()
+    @staticmethod
+    def find_page(after_id: int = 0, limit: int = None, fields: list[str] = None) -> list[Member]:
+        limit = limit or MemberRepository.PAGE_SIZE
+
+        columns = MemberRepository.__columns(fields)
+
+        # Keyset pagination, only the rows of the requested page are fetched and decrypted
+        return MemberRepository.__query(
+            ("after", after_id, limit, columns),
+            MemberRepository.mapper.select_sql(columns, "WHERE id > ? ORDER BY id LIMIT ?"),
+            (after_id, limit),
+            columns
+        )
+
+    @staticmethod
+    def find_page_before(before_id: int, limit: int = None, fields: list[str] = None) -> list[Member]:
+        limit = limit or MemberRepository.PAGE_SIZE
+
+        columns = MemberRepository.__columns(fields)
+
+        return MemberRepository.__query(
+            ("before", before_id, limit, columns),
+            MemberRepository.mapper.select_sql(columns, "WHERE id < ? ORDER BY id DESC LIMIT ?"),
+            (before_id, limit),
+            columns,
+            True
+        )
+
+    @staticmethod
+    def find_page_anchor(page: int, limit: int = None) -> Optional[int]:
+        # Returns the id after which the given (zero based) page starts, only the primary key is read
+        if page <= 0:
+            return 0
+
+        limit = limit or MemberRepository.PAGE_SIZE
+
+        with DBRepository.connection() as db:
+            cursor = db.cursor()
+
+            cursor.execute("SELECT id FROM member ORDER BY id LIMIT 1 OFFSET ?", (page * limit - 1,))
+
+            result = cursor.fetchone()
+
+            cursor.close()
+
+        return result[0] if result is not None else None
+
+    @staticmethod
+    def __columns(fields: list[str] = None) -> tuple:
+        return MemberRepository.mapper.projection(tuple(fields) if fields is not None else None)
+
+    @staticmethod
+    def __query(key: tuple, sql: str, params: tuple, columns: tuple, reverse: bool = False) -> list[Member]:
+        cache = MemberRepository.cache
 
-        cursor.close()
-        db.close()
+        members = cache.get_query(key, columns)
+        if members is not None:
+            return members
 
-        members = []
+        with DBRepository.connection() as db:
+            cursor = db.cursor()
 
-        for memberData in result:
-            member = Member(is_encrypted=True)
-            member.populate(memberData, ['id', 'firstName', 'lastName', 'age', 'weight', 'gender', 'streetName',
-                                         'houseNumber', 'city', 'zipCode', 'emailAddress', 'phoneNumber', 'number'])
-            member.decrypt()
-            members.append(member)
+            cursor.execute(sql, params)
+
+            result = cursor.fetchall()
+
+            cursor.close()
+
+        if reverse:
+            result.reverse()
+
+        members = MemberRepository.mapper.to_models(result, columns, cache)
+
+        cache.put_query(key, members)
 
         return members
 
@@ -47,104 +156,83 @@ class MemberRepository:
 
         return MemberRepository.find_all(member_ids)
 
-
+    @staticmethod
+    def find_ids_by_query(query: str) -> list[int]:
+        # Without duplicates, a member can match on multiple index domains
+        return list(dict.fromkeys(IndexService.find_member_by_query(query)))
 
     @staticmethod
     def persist_member(member: Member):
-        db = DBRepository.create_connection()
-        cursor = db.cursor()
-
-        member.number = MemberRepository.generate_member_number()
-
-        member.encrypt()
-
-        cursor.execute(
-            "INSERT INTO member ("
-            "firstName,"
-            "lastName,"
-            "age,"
-            "weight,"
-            "gender,"
-            "streetName,"
-            "houseNumber,"
-            "city,"
-            "zipCode,"
-            "emailAddress,"
-            "phoneNumber,"
-            "number"
-            ") VALUES ("
-            ":firstName,"
-            ":lastName,"
-            ":age,"
-            ":weight,"
-            ":gender,"
-            ":streetName,"
-            ":houseNumber,"
-            ":city,"
-            ":zipCode,"
-            ":emailAddress,"
-            ":phoneNumber,"
-            ":number"
-            ");",
-            member.serialize()
-        )
+        MemberRepository.persist_members([member])
 
-        ConsoleLogger.vv("Created member: " + str(member.serialize()))
+    @staticmethod
+    def persist_members(members: list[Member]):
+        with DBRepository.connection() as db:
+            cursor = db.cursor()
 
-        db.commit()
+            for member in members:
+                member.number = MemberRepository.__reserve_member_number(cursor)
 
-        cursor.close()
-        db.close()
+                # The model keeps its plain values, so it can be indexed once the transaction is committed
+                cursor.execute(MemberRepository.mapper.insert_sql, MemberRepository.mapper.insert_values(member))
 
-    @staticmethod
-    def update_member(member):
-        db = DBRepository.create_connection()
-        cursor = db.cursor()
+                member.id = cursor.lastrowid
+
+                ConsoleLogger.vv("Created member: %s", member.id)
 
-        member.encrypt()
+            cursor.close()
 
-        cursor.execute(
-            "UPDATE member SET "
-            "firstName = :firstName,"
-            "lastName = :lastName,"
-            "age = :age,"
-            "weight = :weight,"
-            "gender = :gender,"
-            "streetName = :streetName,"
-            "houseNumber = :houseNumber,"
-            "city = :city,"
-            "zipCode = :zipCode,"
-            "emailAddress = :emailAddress,"
-            "phoneNumber = :phoneNumber "
-            "WHERE id = :id",
-            member.serialize()
+        # Only clean once committed, after a rollback the models still differ from the database
+        for member in members:
+            UnitOfWork.on_commit(partial(member.mark_clean, member.clean_values()))
+
+        # Ids only grow, so the new members can only show up in a page that was not full yet
+        MemberRepository.cache.invalidate_queries(
+            lambda key, ids: key[0] == "all" or (key[0] == "after" and len(ids) < key[2])
         )
 
-        ConsoleLogger.vv("Updated member: " + str(member.serialize()))
+    @staticmethod
+    def update_member(member: Member) -> bool:
+        # Only the fields changed since loading are re-encrypted and written
+        fields = [field for field in member.dirty_fields() if field in MemberRepository.UPDATE_FIELDS]
+
+        if len(fields) == 0:
+            ConsoleLogger.vv("Member %s unchanged, update skipped", member.id)
+            return False
+
+        fields = tuple(fields)
+
+        with DBRepository.connection() as db:
+            cursor = db.cursor()
+
+            cursor.execute(
+                MemberRepository.mapper.update_sql(fields),
+                MemberRepository.mapper.update_values(member, fields)
+            )
 
-        db.commit()
+            cursor.close()
 
-        member.decrypt()
+        ConsoleLogger.vv("Updated member %s: %s", member.id, fields)
 
-        cursor.close()
-        db.close()
+        UnitOfWork.on_commit(partial(member.mark_clean, member.clean_values(list(fields))))
+
+        if MemberRepository.cache.models.get(member.id) is not member:
+            MemberRepository.cache.evict(member.id)
+
+        return True
 
     @staticmethod
     def delete_member(member):
-        db = DBRepository.create_connection()
-        cursor = db.cursor()
+        with DBRepository.connection() as db:
+            cursor = db.cursor()
 
-        cursor.execute(
-            "DELETE FROM member WHERE id = :id",
-            member.serialize()
-        )
+            cursor.execute(MemberRepository.mapper.delete_sql, (member.id,))
 
-        ConsoleLogger.vv("Deleted member: " + str(member.id))
+            cursor.close()
 
-        db.commit()
+        ConsoleLogger.vv("Deleted member: " + str(member.id))
 
-        cursor.close()
-        db.close()
+        MemberRepository.cache.evict(member.id)
 
     @staticmethod
     def generate_member_number():
@@ -156,4 +244,45 @@ class MemberRepository:
 
         check_digit = sum(map(lambda x: int(x), [*numbers])) % 10
 
-        return numbers + str(check_digit)
\ No newline at end of file
+        return numbers + str(check_digit)
+
+    @staticmethod
+    def __reserve_member_number(cursor) -> str:
+        # The blind index of every issued number is the primary key of member_number, so the uniqueness check
+        # is a single lookup instead of decrypting every member. Numbers of deleted members stay reserved
+        while True:
+            number = MemberRepository.generate_member_number()
+
+            cursor.execute(
+                "INSERT OR IGNORE INTO member_number (hash) VALUES (?)",
+                (EncryptionService.blind_index(number, "member_number"),)
+            )
+
+            if cursor.rowcount == 1:
+                return number
+
+            ConsoleLogger.vv("Member number already issued, generating another one")
+
+    @staticmethod
+    def index_member_numbers():
+        # Backfills the blind index for members created before it existed
+        with DBRepository.connection() as db:
+            cursor = db.cursor()
+
+            cursor.execute("SELECT (SELECT COUNT(*) FROM member), (SELECT COUNT(*) FROM member_number)")
+            members, numbers = cursor.fetchone()
+
+            if numbers < members:
+                ConsoleLogger.v("Indexing member numbers")
+
+                cursor.execute("SELECT number FROM member")
+
+                cursor.executemany(
+                    "INSERT OR IGNORE INTO member_number (hash) VALUES (?)",
+                    [
+                        (EncryptionService.blind_index(EncryptionService.decrypt(row[0]), "member_number"),)
+                        for row in cursor.fetchall()
+                    ]
+                )
+
+            cursor.close()
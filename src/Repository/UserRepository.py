@@ -1,5 +1,6 @@
 import string
 import random
+from functools import partial
 from typing import Optional
 
 from DTO.LoginError import LoginError
@@ -7,144 +8,160 @@ from Debug.ConsoleLogger import ConsoleLogger
 from Enum.UserType import UserType
 from Models.User import User
 from Repository.BaseClasses.DBRepository import DBRepository
+from Repository.BaseClasses.ModelMapper import ModelMapper
+from Repository.BaseClasses.RepositoryCache import RepositoryCache
+from Repository.BaseClasses.UnitOfWork import UnitOfWork
 from Security.Enum.Role import Role
 from Service.HashService import HashService
 from Service.IndexService import IndexService
 
 
 class UserRepository:
+    cache = RepositoryCache("user")
+    mapper = ModelMapper.for_model(User)
+
+    # The password has its own update and the role and registration date never change
+    UPDATE_FIELDS = ['firstName', 'lastName', 'username']
 
     @staticmethod
-    def find_all_by_role(role: Role, ids: list[int] = None) -> list[User]:
-        db = DBRepository.create_connection()
-        cursor = db.cursor()
+    def find_all_by_role(role: Role, ids: list[int] = None, fields: list[str] = None) -> list[User]:
+        columns = UserRepository.__columns(fields)
+        cache = UserRepository.cache
+
+        key = ("role", role.name, columns)
 
         if ids is None:
-            ids = IndexService.find_user_by_role(role)
+            users = cache.get_query(key, columns)
+            if users is not None:
+                return users
+
+        # Users in the identity map are served from memory, only the others are fetched
+        cached = {}
+        for user_id in ids if ids is not None else IndexService.find_user_by_role(role):
+            user = cache.get(user_id, columns)
+            cached[user_id] = user
+
+        missing = [user_id for user_id, user in cached.items() if user is None]
 
-        cursor.execute('SELECT id, username, password, role, firstName, lastName, registrationDate FROM user '
-                       'WHERE id IN (%s)' % ','.join('?' * len(ids)), ids)
+        if len(missing) > 0:
+            with DBRepository.connection() as db:
+                cursor = db.cursor()
 
-        result = cursor.fetchall()
+                cursor.execute(
+                    UserRepository.mapper.select_sql(columns, "WHERE id IN (%s)" % ','.join('?' * len(missing))),
+                    missing
+                )
 
-        cursor.close()
-        db.close()
+                result = cursor.fetchall()
 
-        users = []
+                cursor.close()
 
-        for userData in result:
-            user = User(is_encrypted=True)
-            user.populate(userData, ['id', 'username', 'password', 'role', 'firstName', 'lastName', 'registrationDate'])
-            user.decrypt()
-            users.append(user)
+            # Lazy models, the password hash is never decrypted for an overview
+            for user in UserRepository.mapper.to_models(result, columns, cache):
+                cached[user.id] = user
+
+        users = [cached[user_id] for user_id in sorted(cached) if cached[user_id] is not None]
+
+        if ids is None:
+            cache.put_query(key, users)
 
         return users
 
     @staticmethod
     def find_by_credentials(username: str, password: str) -> (Optional[User], Optional[LoginError]):
-        db = DBRepository.create_connection()
-        cursor = db.cursor()
-
         user_id = IndexService.find_user_by_username(username)
 
         if user_id is None:
             return None, LoginError.NotFound
 
-        foundUser = cursor.execute(
-            "SELECT id, username, password, role FROM user WHERE id = :user_id", {"user_id": user_id}
-        )
+        with DBRepository.connection() as db:
+            cursor = db.cursor()
+
+            columns = UserRepository.__columns(['username', 'password', 'role'])
+
+            foundUser = cursor.execute(UserRepository.mapper.select_sql(columns, "WHERE id = ?"), (user_id,))
 
-        userValues = foundUser.fetchone()
+            userValues = foundUser.fetchone()
+
+            cursor.close()
+
+        if userValues is None:
+            return None, LoginError.NotFound
 
-        user = User(is_encrypted=True)
-        user.populate(userValues, ['id', 'username', 'password', 'role'])
-        user.decrypt()
+        user = UserRepository.mapper.to_model(userValues, columns)
 
         if HashService.verify_password(password, user.password):
+            # The plain password is only known here, so hashes made with a lower cost are upgraded now
+            if HashService.needs_rehash(user.password):
+                user.password = HashService.hash(password).decode()
+                UserRepository.update_user_password(user)
+
             return user, ""
 
         return None, LoginError.BadCredentials
 
     @staticmethod
-    def persist_user(user):
-        db = DBRepository.create_connection()
-        cursor = db.cursor()
-
-        user.encrypt()
-
-        cursor.execute(
-            "INSERT INTO user ("
-            "firstName,"
-            "lastName,"
-            "role,"
-            "username,"
-            "password,"
-            "registrationDate"
-            ") VALUES ("
-            ":firstName,"
-            ":lastName,"
-            ":role,"
-            ":username,"
-            ":password,"
-            ":registrationDate"
-            ");",
-            user.serialize()
-        )
-
-        ConsoleLogger.vv("User member: " + str(user.serialize()))
-
-        db.commit()
-
-        cursor.close()
-        db.close()
+    def __columns(fields: list[str] = None) -> tuple:
+        return UserRepository.mapper.projection(tuple(fields) if fields is not None else None)
 
     @staticmethod
-    def update_user(user):
-        db = DBRepository.create_connection()
-        cursor = db.cursor()
+    def persist_user(user):
+        # The model keeps its plain values, so it can be indexed once the transaction is committed
+        values = UserRepository.mapper.insert_values(user)
+
+        with DBRepository.connection() as db:
+            cursor = db.cursor()
 
-        user.encrypt()
+            cursor.execute(UserRepository.mapper.insert_sql, values)
 
-        cursor.execute(
-            "UPDATE user SET "
-            "firstName = :firstName,"
-            "lastName = :lastName,"
-            "username = :username "
-            "WHERE id = :id",
-            user.serialize()
-        )
+            user.id = cursor.lastrowid
 
-        ConsoleLogger.vv("Updated user: " + str(user.serialize()))
+            cursor.close()
 
-        db.commit()
+        ConsoleLogger.vv("Created user: %s", user.id)
 
-        user.decrypt()
+        # Only clean once committed, after a rollback the model still differs from the database
+        UnitOfWork.on_commit(partial(user.mark_clean, user.clean_values()))
 
-        cursor.close()
-        db.close()
+        UserRepository.cache.invalidate_queries(lambda key, ids: key[0] == "role")
 
     @staticmethod
-    def update_user_password(user):
-        db = DBRepository.create_connection()
-        cursor = db.cursor()
+    def update_user(user: User) -> bool:
+        # Only the fields changed since loading are re-encrypted and written
+        fields = [field for field in user.dirty_fields() if field in UserRepository.UPDATE_FIELDS]
 
-        user.encrypt()
+        if len(fields) == 0:
+            ConsoleLogger.vv("User %s unchanged, update skipped", user.id)
+            return False
 
-        cursor.execute(
-            "UPDATE user SET "
-            "password = :password "
-            "WHERE id = :id",
-            user.serialize()
-        )
+        UserRepository.__update_fields(user, tuple(fields))
 
-        ConsoleLogger.vv("Updated user password: " + str(user.serialize()))
+        ConsoleLogger.vv("Updated user %s: %s", user.id, fields)
 
-        db.commit()
+        return True
 
-        user.decrypt()
+    @staticmethod
+    def update_user_password(user: User):
+        UserRepository.__update_fields(user, ('password',))
 
-        cursor.close()
-        db.close()
+        ConsoleLogger.vv("Updated user password: %s", user.id)
+
+    @staticmethod
+    def __update_fields(user: User, fields: tuple):
+        with DBRepository.connection() as db:
+            cursor = db.cursor()
+
+            cursor.execute(
+                UserRepository.mapper.update_sql(fields),
+                UserRepository.mapper.update_values(user, fields)
+            )
+
+            cursor.close()
+
+        UnitOfWork.on_commit(partial(user.mark_clean, user.clean_values(list(fields))))
+
+        if UserRepository.cache.models.get(user.id) is not user:
+            UserRepository.cache.evict(user.id)
 
     @staticmethod
     def generate_valid_password() -> str:
@@ -175,20 +192,16 @@ class UserRepository:
 
     @staticmethod
     def delete_user(user: User):
-        db = DBRepository.create_connection()
-        cursor = db.cursor()
+        with DBRepository.connection() as db:
+            cursor = db.cursor()
 
-        cursor.execute(
-            "DELETE FROM user WHERE id = :id",
-            user.serialize()
-        )
+            cursor.execute(UserRepository.mapper.delete_sql, (user.id,))
 
-        ConsoleLogger.vv("Deleted member: " + str(user.id))
+            cursor.close()
 
-        db.commit()
+        ConsoleLogger.vv("Deleted member: " + str(user.id))
 
-        cursor.close()
-        db.close()
+        UserRepository.cache.evict(user.id)
 
     @staticmethod
     def find_by_query(query: str, role: Role):
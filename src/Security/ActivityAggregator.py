@@ -0,0 +1,105 @@
+from collections import Counter
+from datetime import datetime
+from sqlite3 import Cursor
+
+from Enum.ActivityRule import ActivityRule
+from Enum.LogType import LogType
+from Repository.ActivityCounterRepository import ActivityCounterRepository
+from Service.EncryptionService import EncryptionService
+
+
+class ActivityAggregator:
+    # Sliding window counters over the audit stream, fed with every batch the log writer stores. A window is the sum
+    # of fixed size buckets, so the persisted state stays a few rows per key however long the log gets
+
+    # Seconds per bucket, the windows are whole multiples of it
+    BUCKET_SIZE = 60
+
+    # Window of the counters per log type shown in the summary
+    SUMMARY_WINDOW = 3600
+
+    rules: dict[LogType, list[ActivityRule]] = {
+        log_type: [rule for rule in ActivityRule if log_type in rule.value.logTypes] for log_type in LogType
+    }
+
+    @staticmethod
+    def observe(cursor: Cursor, entries: list) -> list:
+        # Counts the entries and returns a log entry for every username that crossed the limit of a rule
+        increments = Counter()
+        counts = Counter()
+        subjects = {}
+
+        for now, username, log_type, _, _, subject in entries:
+            bucket = ActivityAggregator.__bucket(now)
+
+            increments[("type:" + log_type.name, bucket)] += 1
+
+            for rule in ActivityAggregator.rules[log_type]:
+                key = f"rule:{rule.name}:" + EncryptionService.blind_index(subject.lower(), "activity_username")
+
+                increments[(key, bucket)] += 1
+                counts[key] += 1
+                subjects[key] = (rule, username, subject)
+
+        now = entries[-1][0]
+        current = ActivityAggregator.__bucket(now)
+
+        before = {}
+        for key, (rule, _, _) in subjects.items():
+            window = rule.value.window // ActivityAggregator.BUCKET_SIZE
+            before[key] = ActivityCounterRepository.sum_since(cursor, key, current - window)
+
+        ActivityCounterRepository.add(cursor, increments)
+        ActivityCounterRepository.prune(cursor, current - ActivityAggregator.__longest_window())
+
+        flags = []
+
+        # Flagged once when the limit is crossed, not again for every entry while it stays above it
+        # The username column keeps the logged-in user, a username that was only tried is named in the message
+        for key, (rule, username, subject) in subjects.items():
+            after = before[key] + counts[key]
+
+            if before[key] < rule.value.limit <= after:
+                flags.append((
+                    now,
+                    username,
+                    LogType.SuspiciousActivity,
+                    f"{rule.name}: {after} entries for username: “{subject}” within {rule.value.window} seconds "
+                    f"(limit {rule.value.limit})",
+                    False,
+                    subject
+                ))
+
+        return flags
+
+    @staticmethod
+    def summary() -> tuple[dict[LogType, int], dict[ActivityRule, int]]:
+        # Reads a fixed number of counter rows, independent of the size of the log
+        current = ActivityAggregator.__bucket(datetime.now())
+
+        type_counts = ActivityCounterRepository.find_sums(
+            ["type:" + log_type.name for log_type in LogType],
+            current - ActivityAggregator.SUMMARY_WINDOW // ActivityAggregator.BUCKET_SIZE
+        )
+
+        # The highest count of a single subject, so it compares with the limit per user
+        rule_counts = {}
+        for rule in ActivityRule:
+            rule_counts[rule] = ActivityCounterRepository.find_highest_sum(
+                f"rule:{rule.name}:",
+                current - rule.value.window // ActivityAggregator.BUCKET_SIZE
+            )
+
+        return {log_type: type_counts[f"type:{log_type.name}"] for log_type in LogType
+                if f"type:{log_type.name}" in type_counts}, rule_counts
+
+    @staticmethod
+    def __bucket(moment: datetime) -> int:
+        return int(moment.timestamp()) // ActivityAggregator.BUCKET_SIZE
+
+    @staticmethod
+    def __longest_window() -> int:
+        # In buckets, older buckets are no longer part of any window
+        windows = [rule.value.window for rule in ActivityRule] + [ActivityAggregator.SUMMARY_WINDOW]
+
+        return max(windows) // ActivityAggregator.BUCKET_SIZE
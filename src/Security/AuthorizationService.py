@@ -1,7 +1,6 @@
 from Debug.ConsoleLogger import ConsoleLogger
 from Enum.Color import Color
 from Security.Enum.Permission import Permission
-from Security.Enum.Role import Role
 from Security.SecurityHelper import SecurityHelper
 from View.UserInterfaceAlert import UserInterfaceAlert
 from View.UserInterfaceFlow import UserInterfaceFlow
@@ -11,17 +10,16 @@ class AuthorizationService:
 
     @staticmethod
     def current_user_has_permission(permission: Permission) -> bool:
-        user = SecurityHelper.get_logged_in_user()
-
-        if user is None:
+        if SecurityHelper.get_logged_in_user() is None:
             ConsoleLogger.v("AuthorizationService.current_user_has_permission: No user logged in")
             return False
 
-        if permission.value in Role[user.role].value:
-            ConsoleLogger.v(f"AuthorizationService.current_user_has_permission: User has permission '{permission}'")
+        if SecurityHelper.get_permission_mask() & permission.bit:
+            ConsoleLogger.v("AuthorizationService.current_user_has_permission: User has permission '%s'", permission)
             return True
 
-        ConsoleLogger.v(f"AuthorizationService.current_user_has_permission: User does NOT have permission '{permission}'")
+        ConsoleLogger.v("AuthorizationService.current_user_has_permission: User does NOT have permission '%s'",
+                        permission)
         return False
 
     @staticmethod
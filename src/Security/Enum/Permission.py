@@ -25,3 +25,8 @@ class Permission(Enum):
     BackupRestore = "backup_restore"
 
     LogRead = "log_read"
+
+    def __init__(self, value: str):
+        # Every permission is a single bit, so a set of permissions is a single int and a check a single bit test.
+        # The members defined before this one are already in __members__, so the bits follow the definition order
+        self.bit = 1 << len(self.__class__.__members__)
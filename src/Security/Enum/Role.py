@@ -55,3 +55,9 @@ class Role(Enum):
 
         Permission.UserUpdateOwnPassword.value,
     ]
+
+    def __init__(self, permissions: list[str]):
+        # Compiled once when the enum is created, see Permission.bit
+        self.mask = 0
+        for value in permissions:
+            self.mask |= Permission(value).bit
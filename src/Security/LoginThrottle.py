@@ -0,0 +1,90 @@
+import getpass
+import os
+import socket
+import sys
+import time
+from typing import Optional
+
+from Enum.LogType import LogType
+from Repository.BaseClasses.UnitOfWork import UnitOfWork
+from Repository.LogRepository import LogRepository
+from Repository.LoginAttemptRepository import LoginAttemptRepository
+from Service.EncryptionService import EncryptionService
+
+
+class LoginThrottle:
+    # Sliding window over the failed attempts, in seconds
+    WINDOW = 300
+
+    USERNAME_LIMIT = 5
+    SESSION_LIMIT = 10
+
+    @staticmethod
+    def allow(username: str) -> bool:
+        # Checked before any hashing or decryption, the attempts are shared by every process through the database
+        now = time.time()
+
+        allowed = True
+
+        with UnitOfWork():
+            for key, limit, label in LoginThrottle.__keys(username):
+                if LoginAttemptRepository.count_since(key, now - LoginThrottle.WINDOW) >= limit:
+                    allowed = False
+
+                    # Blocked attempts are logged once per block instead of once per attempt
+                    if LoginAttemptRepository.block(key, now) == 1:
+                        LogRepository.log(LogType.UnsuccessfulLoginSuspicious,
+                                          f"login attempts for {label} are blocked",
+                                          subject=LoginThrottle.__subject(key, username))
+                    continue
+
+                blocked = LoginAttemptRepository.release(key)
+
+                if blocked > 0:
+                    LogRepository.log(LogType.UnsuccessfulLoginSuspicious,
+                                      f"{blocked} login attempts for {label} were blocked",
+                                      subject=LoginThrottle.__subject(key, username))
+
+        return allowed
+
+    @staticmethod
+    def record_failure(username: str):
+        now = time.time()
+
+        with UnitOfWork():
+            LoginAttemptRepository.add([key for key, _, _ in LoginThrottle.__keys(username)], now)
+            LoginAttemptRepository.prune(now - LoginThrottle.WINDOW)
+
+    @staticmethod
+    def record_success(username: str):
+        username_key, _, _ = LoginThrottle.__keys(username)[0]
+
+        LoginAttemptRepository.clear(username_key)
+
+    @staticmethod
+    def __keys(username: str) -> list[tuple]:
+        # Only blind index hashes end up in the database, not the usernames that were tried
+        return [
+            (
+                "username:" + EncryptionService.blind_index(username.lower(), "login_username"),
+                LoginThrottle.USERNAME_LIMIT,
+                f"username: “{username}”"
+            ),
+            (
+                "session:" + EncryptionService.blind_index(LoginThrottle.__session(), "login_session"),
+                LoginThrottle.SESSION_LIMIT,
+                "this session"
+            )
+        ]
+
+    @staticmethod
+    def __subject(key: str, username: str) -> Optional[str]:
+        # Only a block of the username is about that account, a block of the session is not
+        return username if key.startswith("username:") else None
+
+    @staticmethod
+    def __session() -> str:
+        # The terminal the application runs in, so restarting the application does not reset the session
+        terminal = os.ttyname(sys.stdin.fileno()) if sys.stdin.isatty() else str(os.getppid())
+
+        return getpass.getuser() + "@" + socket.gethostname() + ":" + terminal
@@ -6,6 +6,9 @@ from Security.Enum.Role import Role
 class SecurityHelper(object):
     __loggedInUser: User = None
 
+    # Permission mask of the role of the logged-in user, resolved once at login
+    __permissionMask: int = 0
+
     @staticmethod
     def get_logged_in_user() -> User:
         return SecurityHelper.__loggedInUser
@@ -14,8 +17,13 @@ class SecurityHelper(object):
     def set_logged_in_user(user: User) -> bool:
 
         if not hasattr(Role, user.role):
-            ConsoleLogger.v(f"UserHelper.set_logged_in_user: User role '{user.role}' not found")
+            ConsoleLogger.v("UserHelper.set_logged_in_user: User role '%s' not found", user.role)
             return False
 
         SecurityHelper.__loggedInUser = user
+        SecurityHelper.__permissionMask = Role[user.role].mask
         return True
+
+    @staticmethod
+    def get_permission_mask() -> int:
+        return SecurityHelper.__permissionMask
@@ -0,0 +1,43 @@
+import math
+
+
+class BloomFilter:
+    # Counting Bloom filter, every position is a small counter so keys can be removed again.
+    # Keys are hex digests (see EncryptionService.blind_index), the positions are derived from them by double hashing
+
+    def __init__(self, capacity: int, false_positive_rate: float):
+        self.capacity = max(capacity, 1)
+        self.falsePositiveRate = false_positive_rate
+
+        self.size = max(math.ceil(-self.capacity * math.log(false_positive_rate) / (math.log(2) ** 2)), 8)
+        self.hashCount = max(round(self.size / self.capacity * math.log(2)), 1)
+
+        self.counters = bytearray(self.size)
+        self.count = 0
+
+    def add(self, key: str):
+        for position in self.__positions(key):
+            # Saturated counters are never decremented again, so they can only cause a false positive
+            if self.counters[position] < 255:
+                self.counters[position] += 1
+
+        self.count += 1
+
+    def remove(self, key: str):
+        if not self.might_contain(key):
+            return
+
+        for position in self.__positions(key):
+            if 0 < self.counters[position] < 255:
+                self.counters[position] -= 1
+
+        self.count -= 1
+
+    def might_contain(self, key: str) -> bool:
+        return all(self.counters[position] > 0 for position in self.__positions(key))
+
+    def __positions(self, key: str) -> list[int]:
+        first = int(key[:16], 16)
+        second = int(key[16:32], 16) | 1
+
+        return [(first + i * second) % self.size for i in range(self.hashCount)]
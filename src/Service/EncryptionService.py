@@ -1,3 +1,4 @@
+import hmac
 import os
 from datetime import datetime, timedelta
 
@@ -5,6 +6,7 @@ from cryptography import x509
 from cryptography.hazmat.primitives import serialization, hashes
 from cryptography.hazmat.primitives.asymmetric import padding
 from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 from cryptography.hazmat.primitives.serialization import load_pem_private_key
 from cryptography.x509.oid import NameOID
 
@@ -13,6 +15,9 @@ class EncryptionService:
     PRIVATE_KEY_PATH = "private_key.pem"
     PUBLIC_KEY_PATH = "public_key.pem"
 
+    # Derived once from the private key material, see blind_index
+    __blindIndexKey = None
+
     @staticmethod
     def encrypt(data) -> bytes:
         cert = x509.load_pem_x509_certificate(EncryptionService.__get_encrypt_key())
@@ -34,6 +39,24 @@ class EncryptionService:
         ))
         return decryptedData.decode()
 
+    @staticmethod
+    def blind_index(value: str, context: str) -> str:
+        # Deterministic keyed hash, equal values can be looked up without decrypting anything.
+        # The context keeps the hashes of different fields apart
+        if EncryptionService.__blindIndexKey is None:
+            EncryptionService.__blindIndexKey = HKDF(
+                algorithm=hashes.SHA256(),
+                length=32,
+                salt=None,
+                info=b"blind-index"
+            ).derive(EncryptionService.__get_decrypt_key())
+
+        return hmac.new(
+            EncryptionService.__blindIndexKey,
+            (context + ":" + value).encode(),
+            "sha256"
+        ).hexdigest()
+
     @staticmethod
     def __get_encrypt_key() -> bytes:
         with open(EncryptionService.PUBLIC_KEY_PATH, 'rb') as f:
@@ -100,3 +123,5 @@ class EncryptionService:
 
         with open(EncryptionService.PRIVATE_KEY_PATH, "wb") as f:
             f.write(bytesKey)
+
+        EncryptionService.__blindIndexKey = None
@@ -1,12 +1,26 @@
+import socket
+import time
+
 import bcrypt
 
+from Debug.ConsoleLogger import ConsoleLogger
+from Repository.ConfigRepository import ConfigRepository
+
 
 class HashService:
+    # Seconds a single hash (and so a login) should take on this host
+    TARGET_LATENCY = 0.25
+
+    MIN_COST = 10
+    MAX_COST = 16
+
+    # Calibrated once per host and kept in the config table, see get_cost
+    cost: int = None
 
     @staticmethod
     def hash(input: str) -> bytes:
         inputBytes = input.encode()
-        salt = bcrypt.gensalt()
+        salt = bcrypt.gensalt(rounds=HashService.get_cost())
         hashed = bcrypt.hashpw(inputBytes, salt)
 
         return hashed
@@ -14,3 +28,49 @@ class HashService:
     @staticmethod
     def verify_password(a, b):
         return bcrypt.checkpw(a.encode(), b.encode())
+
+    @staticmethod
+    def needs_rehash(hashed: str) -> bool:
+        # A bcrypt hash looks like $2b$<cost>$<salt and hash>. Hosts sharing the database can be calibrated to
+        # different costs, a hash is only upgraded and never lowered, so it does not flip between them
+        return int(hashed.split("$")[2]) < HashService.get_cost()
+
+    @staticmethod
+    def get_cost() -> int:
+        if HashService.cost is not None:
+            return HashService.cost
+
+        stored = ConfigRepository.get(HashService.__config_key())
+
+        HashService.cost = int(stored) if stored is not None else HashService.calibrate()
+
+        return HashService.cost
+
+    @staticmethod
+    def calibrate(target_latency: float = None) -> int:
+        target_latency = target_latency or HashService.TARGET_LATENCY
+
+        # Every cost step doubles the work, so a cheap measurement is enough to pick the cost
+        base_cost = 8
+        start = time.perf_counter()
+        bcrypt.hashpw(b"calibration", bcrypt.gensalt(rounds=base_cost))
+        duration = time.perf_counter() - start
+
+        cost = base_cost
+        while cost < HashService.MAX_COST and duration * 2 ** (cost + 1 - base_cost) <= target_latency:
+            cost += 1
+
+        cost = max(cost, HashService.MIN_COST)
+
+        ConfigRepository.set(HashService.__config_key(), str(cost))
+
+        ConsoleLogger.v("Bcrypt cost calibrated to %d (%.3fs per hash)", cost, duration * 2 ** (cost - base_cost))
+
+        HashService.cost = cost
+
+        return cost
+
+    @staticmethod
+    def __config_key() -> str:
+        # Servers of different generations share the database but not their speed
+        return "bcrypt_cost:" + socket.gethostname()
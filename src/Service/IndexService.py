@@ -2,26 +2,39 @@ from typing import Optional
 
 from Debug.ConsoleLogger import ConsoleLogger
 from Enum.IndexDomain import IndexDomain
+from Models.Member import Member
 from Models.User import User
 from Repository.BaseClasses.DBRepository import DBRepository
 from Security.Enum.Role import Role
+from Service.BloomFilter import BloomFilter
 from Service.EncryptionService import EncryptionService
 
 
 class IndexService:
     index: object = None
 
+    # Index keys per (table, id), so a single record can be removed without scanning the index
+    entries: dict = {}
+
+    # Blind index hashes of all usernames, unknown usernames are rejected without touching the index
+    usernames: BloomFilter = None
+
+    USERNAME_FILTER_FALSE_POSITIVE_RATE = 0.01
+
     @staticmethod
     def index_database():
         ConsoleLogger.v("Indexing database")
 
         IndexService.index = {}
+        IndexService.entries = {}
 
         IndexService.__init_domains()
 
         IndexService.__index_users()
         IndexService.__index_members()
 
+        IndexService.__build_username_filter()
+
         ConsoleLogger.v("Database indexed")
 
         pass
@@ -40,14 +53,71 @@ class IndexService:
         IndexService.index[IndexDomain.MEMBER_PHONE.value] = {}
 
     @staticmethod
-    def add_user_to_index(user: User):
-        pass
+    def index_user(user: User):
+        IndexService.remove_user(user.id)
+
+        IndexService.__add_to_index(IndexDomain.USER_USERNAME, user.id, user.username)
+        IndexService.__add_to_index(IndexDomain.USER_ROLE, user.id, user.role)
+        IndexService.__add_to_index(IndexDomain.USER_FIRSTNAME, user.id, user.firstName)
+        IndexService.__add_to_index(IndexDomain.USER_LASTNAME, user.id, user.lastName)
+
+        if IndexService.usernames is not None:
+            IndexService.usernames.add(IndexService.__username_hash(user.username))
+
+            if IndexService.usernames.count > IndexService.usernames.capacity:
+                IndexService.__build_username_filter()
+
+    @staticmethod
+    def remove_user(user_id: int):
+        if IndexService.usernames is not None:
+            for domain, key in IndexService.entries.get(("user", user_id), []):
+                if domain == IndexDomain.USER_USERNAME.value:
+                    IndexService.usernames.remove(IndexService.__username_hash(key))
+
+        IndexService.__remove_from_index("user", user_id)
+
+    @staticmethod
+    def index_member(member: Member):
+        IndexService.remove_member(member.id)
+
+        IndexService.__add_to_index(IndexDomain.MEMBER_NUMBER, member.id, member.number)
+        IndexService.__add_to_index(IndexDomain.MEMBER_FIRSTNAME, member.id, member.firstName)
+        IndexService.__add_to_index(IndexDomain.MEMBER_LASTNAME, member.id, member.lastName)
+        IndexService.__add_to_index(
+            IndexDomain.MEMBER_ADDRESS,
+            member.id,
+            member.streetName + " " + member.houseNumber + " " + member.zipCode
+        )
+        IndexService.__add_to_index(IndexDomain.MEMBER_EMAIL, member.id, member.emailAddress)
+        IndexService.__add_to_index(IndexDomain.MEMBER_PHONE, member.id, member.phoneNumber)
+
+    @staticmethod
+    def remove_member(member_id: int):
+        IndexService.__remove_from_index("member", member_id)
+
+    @staticmethod
+    def username_might_exist(username: str) -> bool:
+        # False means the username is certainly not in use, True still needs the exact lookup
+        if IndexService.usernames is None:
+            return True
+
+        return IndexService.usernames.might_contain(IndexService.__username_hash(username))
+
+    @staticmethod
+    def username_exists(username: str) -> bool:
+        if not IndexService.username_might_exist(username):
+            return False
+
+        return username.lower() in IndexService.index[IndexDomain.USER_USERNAME.value]
 
     @staticmethod
     def find_user_by_username(username: str) -> Optional[int]:
-        for key, value in IndexService.index[IndexDomain.USER_USERNAME.value].items():
-            if key == username:
-                return value[0]
+        if not IndexService.username_might_exist(username):
+            return None
+
+        user_ids = IndexService.index[IndexDomain.USER_USERNAME.value].get(username)
+
+        return user_ids[0] if user_ids else None
 
     @staticmethod
     def find_member_by_query(query: str):
@@ -121,6 +191,24 @@ class IndexService:
 
         ConsoleLogger.v("Users indexed")
 
+    @staticmethod
+    def __build_username_filter():
+        usernames = IndexService.index[IndexDomain.USER_USERNAME.value]
+
+        # Sized with room to grow, it is rebuilt from the index once the capacity is exceeded
+        IndexService.usernames = BloomFilter(
+            max(sum(len(ids) for ids in usernames.values()) * 2, 64),
+            IndexService.USERNAME_FILTER_FALSE_POSITIVE_RATE
+        )
+
+        for username, user_ids in usernames.items():
+            for _ in user_ids:
+                IndexService.usernames.add(IndexService.__username_hash(username))
+
+    @staticmethod
+    def __username_hash(username: str) -> str:
+        return EncryptionService.blind_index(username.lower(), "username")
+
     @staticmethod
     def __index_members():
 
@@ -194,6 +282,23 @@ class IndexService:
 
         IndexService.index[domain.value][value.lower()].append(database_id)
 
+        table = domain.value.split("_")[0]
+        IndexService.entries.setdefault((table, database_id), []).append((domain.value, value.lower()))
+
+    @staticmethod
+    def __remove_from_index(table: str, database_id: int):
+        for domain, key in IndexService.entries.pop((table, database_id), []):
+            ids = IndexService.index[domain].get(key)
+
+            if ids is None:
+                continue
+
+            if database_id in ids:
+                ids.remove(database_id)
+
+            if len(ids) == 0:
+                del IndexService.index[domain][key]
+
     @staticmethod
     def __intersection(lst1, lst2):
         lst3 = [value for value in lst1 if value in lst2]
@@ -0,0 +1,46 @@
+import json
+from typing import TextIO
+
+from DTO.LogEntry import LogEntry
+from Repository.ConfigRepository import ConfigRepository
+from Repository.LogRepository import LogRepository
+
+
+class LogExportService:
+    # Sequence number of the last exported entry, so every export continues where the previous one stopped
+    CURSOR_KEY = "log_export_cursor"
+
+    # Entries decrypted and written per step, the memory used does not depend on the size of the log
+    BATCH_SIZE = 100
+
+    @staticmethod
+    def export(output: TextIO) -> int:
+        # Writes the entries after the cursor as JSON lines and returns how many were written
+        cursor = int(ConfigRepository.get(LogExportService.CURSOR_KEY) or 0)
+
+        reader = LogRepository.reader()
+
+        page = reader.at_sequence(cursor + 1, LogExportService.BATCH_SIZE)
+
+        exported = 0
+
+        while len(page.lines) > 0:
+            for line in page.lines:
+                entry = LogEntry.from_line(line)
+
+                # Lines left in the active segment by an interrupted rotation are already exported
+                if entry.sequence <= cursor:
+                    continue
+
+                output.write(json.dumps(entry.to_dict(), ensure_ascii=False) + "\n")
+
+                cursor = entry.sequence
+                exported += 1
+
+            # Saved once the batch is written, an interrupted export repeats at most one batch
+            output.flush()
+            ConfigRepository.set(LogExportService.CURSOR_KEY, str(cursor))
+
+            page = reader.newer(page.end, LogExportService.BATCH_SIZE)
+
+        return exported
@@ -0,0 +1,49 @@
+from multiprocessing import Process
+
+from Enum.LogType import LogType
+from Repository.LogRepository import LogRepository
+
+
+class ConcurrentLogTest:
+
+    @staticmethod
+    def run(processes: int = 8, entries: int = 50):
+        # Several sessions log at the same time, every sequence number must be used exactly once and without gaps
+        latest = LogRepository.reader().latest(1)
+        first = latest.last_sequence() + 1 if len(latest.lines) > 0 else 1
+
+        workers = [
+            Process(target=ConcurrentLogTest.log_entries, args=(process, entries)) for process in range(processes)
+        ]
+
+        for worker in workers:
+            worker.start()
+
+        for worker in workers:
+            worker.join()
+
+        # The aggregator can flag the burst, so there may be more lines than the workers logged
+        reader = LogRepository.reader()
+        page = reader.at_sequence(first, processes * entries)
+        lines = page.lines
+        while len(page.lines) > 0:
+            page = reader.newer(page.end, processes * entries)
+            lines += page.lines
+
+        sequences = [int(line.split(",")[0]) for line in lines]
+        messages = {line.split(",")[5] for line in lines}
+
+        expected = {f"process {process} entry {entry}" for process in range(processes) for entry in range(entries)}
+
+        assert sequences == list(range(first, first + len(sequences))), "Sequence numbers collide or have gaps"
+        assert expected <= messages, "Log entries are missing"
+
+        print(f"{processes} processes logged {processes * entries} entries, "
+              f"sequence numbers {first} to {sequences[-1]}")
+
+    @staticmethod
+    def log_entries(process: int, entries: int):
+        for entry in range(entries):
+            LogRepository.log(LogType.MembersRead, f"process {process} entry {entry}", sync=False)
+
+        LogRepository.flush()
@@ -1,7 +1,6 @@
-from os import system
-
 from Enum.Color import Color
 from View.UserInterfaceFlowItem import UserInterfaceFlowItem
+from View.UserInterfaceRenderer import UserInterfaceRenderer
 
 
 class UserInterfaceAlert(UserInterfaceFlowItem):
@@ -12,6 +11,6 @@ class UserInterfaceAlert(UserInterfaceFlowItem):
             self.consoleColor = color
 
     def render(self, is_retrying: bool = False):
-        system("title " + self.consoleTitle)
-        print(self.consoleColor.value + self.text + Color.ENDC.value)
+        UserInterfaceRenderer.title(self.consoleTitle)
+        UserInterfaceRenderer.write_line(self.consoleColor.value + self.text + Color.ENDC.value)
         return True, None
@@ -1,8 +1,7 @@
-import sys
-from os import name, system
 from time import sleep
 
 from View.UserInterfaceFlowItem import UserInterfaceFlowItem
+from View.UserInterfaceRenderer import UserInterfaceRenderer
 
 
 class UserInterfaceFlow:
@@ -43,12 +42,15 @@ class UserInterfaceFlow:
                     self.memory[current.memoryKey] = value
                 self.currentScreen += 1
 
+        UserInterfaceRenderer.flush()
+
         return self.memory
 
     @staticmethod
     def quick_run(screen: UserInterfaceFlowItem, sleep_time: int = 2):
         UserInterfaceFlow.clear()
         screen.render()
+        UserInterfaceRenderer.flush()
         if sleep_time:
             sleep(sleep_time)
 
@@ -56,16 +58,11 @@ class UserInterfaceFlow:
     def quick_run_till_next(screen: UserInterfaceFlowItem, sleep_time: int = 2):
         UserInterfaceFlow.clear()
         screen.render()
+        UserInterfaceRenderer.flush()
 
     @staticmethod
     def clear():
-        # for windows
-        if name == 'nt':
-            _ = system('cls')
-
-        # for mac and linux(here, os.name is 'posix')
-        else:
-            _ = system('clear')
+        UserInterfaceRenderer.clear()
 
     @staticmethod
     def clear_line(lines_up: int = 1):
@@ -75,11 +72,11 @@ class UserInterfaceFlow:
 
         # Move the cursor up and clear each line
         for _ in range(lines_up):
-            sys.stdout.write(CURSOR_UP_ONE)
+            UserInterfaceRenderer.write(CURSOR_UP_ONE)
 
-        sys.stdout.write(ERASE_LINE)
+        UserInterfaceRenderer.write(ERASE_LINE)
 
         # Move the cursor back to the original position
         if lines_up > 1:
             for _ in range(lines_up):
-                sys.stdout.write(CURSOR_DOWN_ONE)
+                UserInterfaceRenderer.write(CURSOR_DOWN_ONE)
@@ -0,0 +1,49 @@
+from typing import Callable
+
+from DTO.Transition import Transition
+from Enum.TransitionType import TransitionType
+
+
+class UserInterfaceNavigator:
+    # Screens return a Transition instead of calling the next screen themselves, so navigating back and forth
+    # never grows the call stack. Returning nothing goes back to the previous screen
+    current = None
+
+    def __init__(self):
+        self.stack: list[Transition] = []
+
+    @staticmethod
+    def run(action: Callable, *args, **kwargs):
+        navigator = UserInterfaceNavigator()
+
+        previous = UserInterfaceNavigator.current
+        UserInterfaceNavigator.current = navigator
+
+        try:
+            navigator.stack.append(Transition.push(action, *args, **kwargs))
+
+            while len(navigator.stack) > 0:
+                screen = navigator.stack[-1]
+
+                transition = screen.action(*screen.args, **screen.kwargs)
+
+                if transition is None or transition.type == TransitionType.BACK:
+                    navigator.stack.pop()
+                elif transition.type == TransitionType.PUSH:
+                    navigator.stack.append(transition)
+                elif transition.type == TransitionType.REPLACE:
+                    navigator.stack[-1] = transition
+                elif transition.type == TransitionType.EXIT:
+                    navigator.stack.clear()
+        finally:
+            UserInterfaceNavigator.current = previous
+
+    @staticmethod
+    def state() -> dict:
+        # The state of the running screen, it is still there when the screen is returned to
+        navigator = UserInterfaceNavigator.current
+
+        if navigator is None or len(navigator.stack) == 0:
+            return {}
+
+        return navigator.stack[-1].state
@@ -0,0 +1,66 @@
+import shutil
+
+from View.UserInterfaceFlowItem import UserInterfaceFlowItem
+from View.UserInterfaceRenderer import UserInterfaceRenderer
+
+
+class UserInterfacePagedTable(UserInterfaceFlowItem):
+    # Renders a single page of rows. Column widths are computed over the visible rows only and capped, so rendering
+    # costs the same however many rows the data has.
+    # The table takes the rows of the page instead of a page source: members are paged by id (keyset) and the log
+    # from byte positions or with a filter query, each with its own state between pages, so fetching the page is left
+    # to the controller
+
+    MAX_COLUMN_WIDTH = 40
+
+    # Lines kept free for the header, the prompt and the alerts around the table
+    RESERVED_LINES = 8
+
+    def __init__(self, header: list[str], rows: list[list], limit: int = None):
+        self.header = header
+
+        # Controllers may fetch one row more than visible to know whether there is a next page
+        self.rows = rows[:limit or UserInterfacePagedTable.page_size()]
+
+    def render(self, is_retrying: bool = False):
+        rows = [list(map(UserInterfacePagedTable.__cell, self.header))] \
+            + [list(map(UserInterfacePagedTable.__cell, row)) for row in self.rows]
+
+        widths = [0] * max(map(len, rows))
+        for row in rows:
+            for index, cell in enumerate(row):
+                widths[index] = max(widths[index], len(cell))
+
+        # Numbers are aligned right, like tabulate does
+        numeric = [
+            all(isinstance(row[index], (int, float)) for row in self.rows if index < len(row))
+            for index in range(len(widths))
+        ]
+
+        lines = [UserInterfacePagedTable.__line(rows[0], widths, numeric),
+                 "  ".join("-" * width for width in widths)]
+        lines += [UserInterfacePagedTable.__line(row, widths, numeric) for row in rows[1:]]
+
+        UserInterfaceRenderer.write_line("\n".join(lines))
+
+        return True, None
+
+    @staticmethod
+    def page_size() -> int:
+        return max(shutil.get_terminal_size().lines - UserInterfacePagedTable.RESERVED_LINES, 5)
+
+    @staticmethod
+    def __cell(value) -> str:
+        text = str(value)
+
+        if len(text) > UserInterfacePagedTable.MAX_COLUMN_WIDTH:
+            return text[:UserInterfacePagedTable.MAX_COLUMN_WIDTH - 1] + "…"
+
+        return text
+
+    @staticmethod
+    def __line(row: list[str], widths: list[int], numeric: list[bool]) -> str:
+        return "  ".join(
+            cell.rjust(widths[index]) if numeric[index] else cell.ljust(widths[index])
+            for index, cell in enumerate(row)
+        ).rstrip()
@@ -7,6 +7,7 @@ from View.UserInterfaceAlert import UserInterfaceAlert
 from Enum.Color import Color
 from View.UserInterfaceFlow import UserInterfaceFlow
 from View.UserInterfaceFlowItem import UserInterfaceFlowItem
+from View.UserInterfaceRenderer import UserInterfaceRenderer
 
 
 class UserInterfacePrompt(UserInterfaceFlowItem):
@@ -22,6 +23,7 @@ class UserInterfacePrompt(UserInterfaceFlowItem):
         self.value = value
 
     def render(self, is_retrying: bool = False):
+        UserInterfaceRenderer.flush()
 
         if self.isPassword:
             inp = getpass.getpass(self.promptText)
@@ -46,5 +48,6 @@ class UserInterfacePrompt(UserInterfaceFlowItem):
     def render_validation_error(message: str):
         UserInterfaceFlow.clear_line()
         UserInterfaceAlert(text=message, color=Color.FAIL).render()
+        UserInterfaceRenderer.flush()
         sleep(2)
         UserInterfaceFlow.clear_line()
@@ -0,0 +1,77 @@
+import atexit
+import sys
+import time
+from os import name, system
+
+
+class UserInterfaceRenderer:
+    # A screen is collected in a buffer and written with a single write once it has to be visible,
+    # before input is read or before sleeping. Clearing and the title use ANSI escape sequences,
+    # so no shell is started for every screen
+
+    CLEAR_SCREEN = '\x1b[2J\x1b[3J\x1b[H'
+
+    buffer: list[str] = []
+    title_text: str = None
+
+    # Render latency, from clearing the screen until it is written to the terminal
+    renders: int = 0
+    render_time: float = 0.0
+    max_render_time: float = 0.0
+    render_started: float = None
+
+    @staticmethod
+    def write(text: str):
+        UserInterfaceRenderer.buffer.append(text)
+
+    @staticmethod
+    def write_line(text: str):
+        UserInterfaceRenderer.buffer.append(text + "\n")
+
+    @staticmethod
+    def clear():
+        UserInterfaceRenderer.render_started = time.perf_counter()
+
+        # Anything not written yet would be cleared anyway
+        UserInterfaceRenderer.buffer = [UserInterfaceRenderer.CLEAR_SCREEN]
+
+    @staticmethod
+    def title(text: str):
+        # Only written when it changes, the title stays set between screens
+        if text == UserInterfaceRenderer.title_text:
+            return
+
+        UserInterfaceRenderer.title_text = text
+        UserInterfaceRenderer.write(f"\x1b]0;{text}\x07")
+
+    @staticmethod
+    def flush():
+        if len(UserInterfaceRenderer.buffer) > 0:
+            sys.stdout.write("".join(UserInterfaceRenderer.buffer))
+            UserInterfaceRenderer.buffer = []
+
+        sys.stdout.flush()
+
+        if UserInterfaceRenderer.render_started is not None:
+            duration = time.perf_counter() - UserInterfaceRenderer.render_started
+            UserInterfaceRenderer.render_started = None
+
+            UserInterfaceRenderer.renders += 1
+            UserInterfaceRenderer.render_time += duration
+            UserInterfaceRenderer.max_render_time = max(UserInterfaceRenderer.max_render_time, duration)
+
+    @staticmethod
+    def stats() -> str:
+        renders = UserInterfaceRenderer.renders
+        average = UserInterfaceRenderer.render_time / renders if renders > 0 else 0.0
+
+        return f"{renders} screens, average {average * 1000:.2f}ms, " \
+               f"max {UserInterfaceRenderer.max_render_time * 1000:.2f}ms"
+
+
+# Older Windows consoles only interpret escape sequences once virtual terminal processing is switched on,
+# which an empty system call does as a side effect
+if name == 'nt':
+    system("")
+
+atexit.register(UserInterfaceRenderer.flush)
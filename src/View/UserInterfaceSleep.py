@@ -1,6 +1,7 @@
 from time import sleep
 
 from View.UserInterfaceFlowItem import UserInterfaceFlowItem
+from View.UserInterfaceRenderer import UserInterfaceRenderer
 
 
 class UserInterfaceSleep(UserInterfaceFlowItem):
@@ -9,5 +10,6 @@ class UserInterfaceSleep(UserInterfaceFlowItem):
         self.sleepTime = sleep_time
 
     def render(self, is_retrying: bool = False):
+        UserInterfaceRenderer.flush()
         sleep(self.sleepTime)
         return True, None
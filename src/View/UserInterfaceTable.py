@@ -1,6 +1,7 @@
 from tabulate import tabulate
 
 from View.UserInterfaceFlowItem import UserInterfaceFlowItem
+from View.UserInterfaceRenderer import UserInterfaceRenderer
 from View.UserInterfaceTableRow import UserInterfaceTableRow
 
 
@@ -15,9 +16,9 @@ class UserInterfaceTable(UserInterfaceFlowItem):
     def render(self, is_retrying: bool = False):
         rows_formatted = list(map(lambda row: row.columns, self.rows))
         if self.has_header:
-            print(tabulate(rows_formatted, headers="firstrow"))
+            UserInterfaceRenderer.write_line(tabulate(rows_formatted, headers="firstrow"))
         else:
-            print(tabulate(rows_formatted))
+            UserInterfaceRenderer.write_line(tabulate(rows_formatted))
         return True, None
 
     @staticmethod
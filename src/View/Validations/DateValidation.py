@@ -0,0 +1,18 @@
+from datetime import datetime
+
+from View.Validations.Validation import Validation
+
+
+class DateValidation(Validation):
+
+    @staticmethod
+    def validate(value: str) -> [bool, str]:
+        if value == "":
+            return [True, ""]
+
+        try:
+            datetime.strptime(value, "%d-%m-%Y")
+        except ValueError:
+            return [False, "Datum moet in het formaat dd-mm-jjjj zijn"]
+
+        return [True, ""]
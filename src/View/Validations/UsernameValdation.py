@@ -14,9 +14,7 @@ class UsernameValidation(Validation):
                            "underscore (_), en alleen letters, cijfers, underscores (_), apostrofes ('), "
                            "en punten (.) bevatten."]
 
-        existingUser = IndexService.find_user_by_username(value)
-
-        if existingUser is not None:
+        if IndexService.username_exists(value):
             return [False, "Deze username is al in gebruik"]
 
         return [True, ""]
@@ -0,0 +1,10 @@
+from View.Validations.Validation import Validation
+
+
+class YesNoValidation(Validation):
+
+    @staticmethod
+    def validate(value: str) -> [bool, str]:
+        if value.upper() not in ["", "J", "N"]:
+            return [False, "Vul J voor ja of N voor nee in"]
+        return [True, ""]
@@ -4,8 +4,11 @@ from Configuration.DatabaseConfiguration import DatabaseConfiguration
 from Controllers.LoginController import LoginController
 from Debug.ConsoleLogger import ConsoleLogger
 from Enum.Color import Color
+from Enum.LogType import LogType
+from Repository.LogRepository import LogRepository
 from Service.EncryptionService import EncryptionService
 from Service.IndexService import IndexService
+from Service.LogExportService import LogExportService
 from View.UserInterfaceAlert import UserInterfaceAlert
 from View.UserInterfaceFlow import UserInterfaceFlow
 
@@ -38,12 +41,30 @@ def main():
     # exit(0)
     # CreateMemberTest.run()
     # CreateConsultantTest.run(uname="consultant", pword="admin")
+    # ConcurrentLogTest.run(processes=8, entries=50)
     # exit(0)
 
     lc = LoginController()
     lc.login()
 
 
+def export_log(filename: str = None):
+    # Appends the log entries since the previous export to the file, or writes them to stdout for a log pipeline
+    DatabaseConfiguration.start()
+
+    output = open(filename, "a", encoding="utf-8") if filename is not None else sys.stdout
+
+    try:
+        exported = LogExportService.export(output)
+    finally:
+        if filename is not None:
+            output.close()
+
+    LogRepository.log(LogType.LogExported, f"{exported} entries exported")
+
+    sys.stderr.write(f"{exported} log entries exported\n")
+
+
 if __name__ == '__main__':
 
     # DEBUG CONSOLE LOGGING
@@ -55,5 +76,8 @@ if __name__ == '__main__':
                 ConsoleLogger.set_loglevel(2)
             case "-vvv":
                 ConsoleLogger.set_loglevel(3)
+            case "--export-log":
+                export_log(sys.argv[2] if len(sys.argv) > 2 else None)
+                sys.exit(0)
 
     main()